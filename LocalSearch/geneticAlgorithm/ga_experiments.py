@@ -0,0 +1,147 @@
+import csv
+import json
+import time
+import argparse
+import itertools
+import numpy as np
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from password_oracle import PasswordOracle, CachedOracle, ALPHABETS
+from genetic_engine import GeneticEngine
+from selection import SELECTIONS
+
+FIELDS = ['mutation_rate', 'population', 'selection', 'mutation', 'patience', 'seed', 'solved', 'generations', 'best',
+          'submissions', 'queries', 'restarts', 'time_ms']
+MUTATIONS = ("fixed", "adaptive")
+PERCENTILES = (0, 25, 50, 75, 90, 100)
+
+
+def run_config(mutation_rate, population, selection, mutation, patience, seeds, length, alphabet, elitism,
+               max_generations, keep_history=False):
+    rows = []
+    for seed in seeds:
+        # seed k hides the same secret in every configuration, so configurations are compared on equal terms
+        secret_seed, search_seed = np.random.SeedSequence(seed).spawn(2)
+        oracle = CachedOracle(PasswordOracle(length, alphabet, seed=secret_seed))
+        engine = GeneticEngine(oracle, population, mutation_rate, search_seed, selection, elitism,
+                               mutation == "adaptive", patience)
+        start = time.perf_counter()
+        solved = engine.run(max_generations)
+        rows.append({
+            'mutation_rate': mutation_rate,
+            'population': population,
+            'selection': selection,
+            'mutation': mutation,
+            'patience': patience,
+            'seed': seed,
+            'solved': solved,
+            'generations': engine.generation,
+            'best': engine.best,
+            'submissions': oracle.submissions,
+            'queries': oracle.queries,
+            'restarts': engine.restarts,
+            'time_ms': (time.perf_counter() - start) * 1000,
+        })
+        if keep_history:
+            rows[-1]['history'] = engine.history
+    return rows
+
+
+def run_sweep(mutation_rates, populations, selections, seeds, length=6, alphabet=ALPHABETS["lowercase"], elitism=0,
+              max_generations=10000, workers=None, mutations=("fixed",), patiences=(0,), keep_history=False):
+    rows = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_config, mutation_rate, population, selection, mutation, patience, seeds, length,
+                               alphabet, min(elitism, population - 1), max_generations, keep_history)
+                   for mutation_rate, population, selection, mutation, patience
+                   in itertools.product(mutation_rates, populations, selections, mutations, patiences)]
+        for future in futures:
+            rows.extend(future.result())
+    return rows
+
+
+def distribution(values):
+    return dict(zip((f"p{p}" for p in PERCENTILES), np.percentile(values, PERCENTILES).tolist()))
+
+
+def summarize(rows):
+    groups = defaultdict(list)
+    for row in rows:
+        groups[(row['mutation_rate'], row['population'], row['selection'], row['mutation'], row['patience'])].append(row)
+
+    summary = []
+    for (mutation_rate, population, selection, mutation, patience), group in sorted(groups.items()):
+        solved = [row for row in group if row['solved']]
+        summary.append({
+            'mutation_rate': mutation_rate,
+            'population': population,
+            'selection': selection,
+            'mutation': mutation,
+            'patience': patience,
+            'runs': len(group),
+            'solved': len(solved),
+            # unsolved runs have no generations-to-solve, so only solved runs shape that distribution
+            'generations': distribution([row['generations'] for row in solved]) if solved else None,
+            'submissions': distribution([row['submissions'] for row in group]),
+            'queries': distribution([row['queries'] for row in group]),
+            'restarts': float(np.mean([row['restarts'] for row in group])),
+            'time_ms': float(np.mean([row['time_ms'] for row in group])),
+        })
+    return summary
+
+
+def print_summary(summary):
+    def fmt(value, spec):
+        return format(value, spec) if value is not None else '-'
+
+    print(f"{'rate':>6}{'pop':>7}  {'selection':<12}{'mutation':<10}{'patience':>9}{'runs':>6}{'solved':>8}"
+          f"{'gen p50':>9}{'gen p90':>9}{'sub p50':>9}{'queries p50':>13}{'time ms':>10}")
+    for row in summary:
+        generations = row['generations'] or {}
+        print(f"{row['mutation_rate']:>6.2f}{row['population']:>7}  {row['selection']:<12}{row['mutation']:<10}"
+              f"{row['patience']:>9}{row['runs']:>6}"
+              f"{row['solved']:>8}{fmt(generations.get('p50'), '.0f'):>9}{fmt(generations.get('p90'), '.0f'):>9}"
+              f"{row['submissions']['p50']:>9.0f}{row['queries']['p50']:>13.0f}{row['time_ms']:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep genetic algorithm parameters over many seeds")
+    parser.add_argument('-m', '--mutation-rates', type=float, nargs='+', default=[0.1, 0.3, 0.5, 0.7, 0.9])
+    parser.add_argument('-p', '--populations', type=int, nargs='+', default=[7, 50, 200])
+    parser.add_argument('-s', '--selections', nargs='+', default=list(SELECTIONS), choices=list(SELECTIONS))
+    parser.add_argument('--mutations', nargs='+', default=["fixed"], choices=MUTATIONS,
+                        help="fixed one-point mutation and/or self-adaptive per-gene rates")
+    parser.add_argument('--patience', type=int, nargs='+', default=[0],
+                        help="generations without progress before a partial restart, 0 to never restart")
+    parser.add_argument('-n', '--seeds', type=int, default=20, help="runs per configuration")
+    parser.add_argument('--length', type=int, default=6)
+    parser.add_argument('--alphabet', choices=sorted(ALPHABETS), default="lowercase")
+    parser.add_argument('--elitism', type=int, default=0)
+    parser.add_argument('--generations', type=int, default=10000, help="give up after this many generations")
+    parser.add_argument('-w', '--workers', type=int, default=None)
+    parser.add_argument('--csv', help="write per-run results to this CSV file")
+    parser.add_argument('--json', help="write the per-configuration distributions to this JSON file")
+    parser.add_argument('--history', help="write every run's best-fitness-per-generation history to this JSON file")
+    args = parser.parse_args()
+
+    rows = run_sweep(args.mutation_rates, args.populations, args.selections, range(args.seeds), args.length,
+                     ALPHABETS[args.alphabet], args.elitism, args.generations, args.workers, args.mutations,
+                     args.patience, bool(args.history))
+    summary = summarize(rows)
+    print_summary(summary)
+
+    if args.csv:
+        with open(args.csv, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(rows)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(summary, f, indent=2)
+    if args.history:
+        with open(args.history, 'w') as f:
+            json.dump(rows, f)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+import argparse
+import time
+import numpy as np
+from collections import namedtuple
+from password_oracle import PasswordOracle, CachedOracle, ALPHABETS
+from selection import SELECTIONS
+
+RANDOM, PARENT1, PARENT2, MUTATION, ELITE = range(5)
+
+Snapshot = namedtuple('Snapshot', 'generation population origins fitness parents best leaders')
+
+
+class GeneticEngine:
+    def __init__(self, oracle, pop_size=7, mutation_rate=0.5, seed=None, selection="top-two", elitism=0,
+                 adaptive=False, patience=0, restart_fraction=0.5):
+        if pop_size < 2:
+            raise ValueError("The population needs at least two individuals")
+        if selection not in SELECTIONS:
+            raise ValueError(f"Selection must be one of {', '.join(SELECTIONS)}")
+        if not 0 <= elitism < pop_size:
+            raise ValueError("Elitism must leave room for at least one child")
+        if not 0 < restart_fraction <= 1:
+            raise ValueError("The restart fraction must be in (0, 1]")
+        self.oracle = oracle
+        self.pop_size = pop_size
+        self.length = oracle.length
+        self.alphabet_size = len(oracle.alphabet)
+        self.mutation_rate = mutation_rate
+        self.selection = selection
+        self.elitism = elitism
+        self.adaptive = adaptive
+        self.patience = patience
+        self.restart_fraction = restart_fraction
+        # self-adaptive rates are per gene, on top of one guaranteed point mutation per child; since no child is
+        # then a plain copy, adaptive runs always carry the best individual over
+        self.min_rate, self.max_rate = 0.01 / self.length, 0.5
+        self.tau = 1 / np.sqrt(self.length)
+        self.rng = np.random.default_rng(seed)
+        self.generation = 0
+        self.best = 0
+        self.best_genome = None
+        self.improved_at = 0
+        self.restarts = 0
+        self.history = []
+        self.randomize()
+
+    @property
+    def initial_rate(self):
+        return float(np.clip(self.mutation_rate / self.length, self.min_rate, self.max_rate))
+
+    def randomize(self):
+        self.population = self.rng.integers(self.alphabet_size, size=(self.pop_size, self.length), dtype=np.uint8)
+        self.origins = np.full(self.population.shape, RANDOM, dtype=np.uint8)
+        self.rates = np.full(self.pop_size, self.initial_rate)
+        self.fitness = None
+        self.parents = None
+
+    def evaluate(self):
+        self.fitness = self.oracle.score(self.population)
+        top = int(np.argmax(self.fitness))
+        if self.best_genome is None or self.fitness[top] > self.best:
+            self.best = int(self.fitness[top])
+            self.best_genome = self.population[top].copy()
+            self.improved_at = self.generation
+        # one entry per generation, even when a generation is scored again after hand edits
+        del self.history[self.generation:]
+        self.history.append(int(self.fitness[top]))
+        return self.fitness
+
+    @property
+    def stagnant(self):
+        return self.patience and self.generation - self.improved_at >= self.patience
+
+    @property
+    def solved(self):
+        return self.fitness is not None and int(self.fitness.max()) == self.length
+
+    def select_parents(self):
+        # the two fittest individuals, found without sorting the whole population
+        top = np.argpartition(-self.fitness, 1)[:2]
+        return top[np.argsort(-self.fitness[top], kind='stable')]
+
+    def emigrants(self, count):
+        top = np.argpartition(-self.fitness, count - 1)[:count]
+        return self.population[top], self.fitness[top]
+
+    def immigrate(self, genomes, scores):
+        # newcomers replace the weakest residents and keep the score their home island gave them
+        worst = np.argpartition(self.fitness, len(genomes) - 1)[:len(genomes)]
+        self.population[worst] = genomes
+        self.fitness[worst] = scores
+        self.origins[worst] = RANDOM
+        self.rates[worst] = self.initial_rate
+
+    def breed(self):
+        if self.fitness is None:
+            self.evaluate()
+        if self.fitness.max() <= 0:
+            # a fresh random population is still a new generation, so callers that act on generation ticks move on
+            self.randomize()
+            self.generation += 1
+            return
+
+        # one read of the mode, so the elitism floor and the mutation branch always agree
+        population, fitness, adaptive = self.population, self.fitness, self.adaptive
+        elitism = max(self.elitism, 1) if adaptive else self.elitism
+        count = self.pop_size - elitism
+        first, second = SELECTIONS[self.selection](fitness, count, self.rng)
+        self.parents = (population[first[0]].copy(), population[second[0]].copy())
+
+        # uniform crossover biased towards the fitter parent of each child, one mask for the whole generation
+        fit1, fit2 = np.clip(fitness[first], 0, None), np.clip(fitness[second], 0, None)
+        total = fit1 + fit2
+        bias = np.divide(fit1, total, out=np.full(count, 0.5), where=total > 0)
+        mask = self.rng.random((count, self.length)) < bias[:, None]
+        children = np.where(mask, population[first], population[second])
+        origins = np.where(mask, PARENT1, PARENT2).astype(np.uint8)
+
+        if adaptive:
+            # each child inherits its first parent's rate, perturbed log-normally, so rates that keep
+            # producing fit children spread through the population
+            rates = self.rates[first] * np.exp(self.tau * self.rng.standard_normal(count))
+            rates = np.clip(rates, self.min_rate, self.max_rate)
+            mutated = self.rng.random((count, self.length)) < rates[:, None]
+            # one point always mutates, so a rate that has shrunk towards zero does not leave children as clones
+            mutated[np.arange(count), self.rng.integers(self.length, size=count)] = True
+            children[mutated] = self.rng.integers(self.alphabet_size, size=int(mutated.sum()), dtype=np.uint8)
+            origins[mutated] = MUTATION
+        else:
+            rates = np.full(count, self.initial_rate)
+            mutants = np.flatnonzero(self.rng.random(count) < self.mutation_rate)
+            points = self.rng.integers(self.length, size=len(mutants))
+            children[mutants, points] = self.rng.integers(self.alphabet_size, size=len(mutants), dtype=np.uint8)
+            origins[mutants, points] = MUTATION
+
+        if self.stagnant:
+            # a partial restart: offspring rows are interchangeable, so the last ones are a random subset
+            fresh = max(1, int(count * self.restart_fraction))
+            children[-fresh:] = self.rng.integers(self.alphabet_size, size=(fresh, self.length), dtype=np.uint8)
+            origins[-fresh:] = RANDOM
+            rates[-fresh:] = self.initial_rate
+            self.improved_at = self.generation + 1
+            self.restarts += 1
+
+        if elitism:
+            # the elite go through unchanged at the top, where a sampled display will show them
+            elite = np.argpartition(-fitness, elitism - 1)[:elitism]
+            elite = elite[np.argsort(-fitness[elite], kind='stable')]
+            children = np.concatenate([population[elite], children])
+            origins = np.concatenate([np.full((elitism, self.length), ELITE, dtype=np.uint8), origins])
+            rates = np.concatenate([self.rates[elite], rates])
+
+        self.population, self.origins, self.rates = children, origins, rates
+        self.fitness = None
+        self.generation += 1
+
+    def run(self, max_generations=10000):
+        while self.generation < max_generations:
+            self.evaluate()
+            if self.solved:
+                return True
+            self.breed()
+        return False
+
+    def snapshot(self, rows=None):
+        # only the rows a display asks for are copied, so watching a big population stays cheap
+        rows = slice(rows)
+        fitness, leaders = None, None
+        if self.fitness is not None:
+            fitness, leaders = self.fitness[rows].copy(), self.select_parents()
+        return Snapshot(self.generation, self.population[rows].copy(), self.origins[rows].copy(), fitness,
+                        self.parents, self.best, leaders)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evolve a random password without the GUI.")
+    parser.add_argument('--length', type=int, default=6)
+    parser.add_argument('--population', type=int, default=7)
+    parser.add_argument('--alphabet', choices=sorted(ALPHABETS), default="lowercase")
+    parser.add_argument('--mutation-rate', type=float, default=0.5)
+    parser.add_argument('--selection', choices=sorted(SELECTIONS), default="top-two")
+    parser.add_argument('--elitism', type=int, default=0)
+    parser.add_argument('--adaptive', action='store_true', help="evolve a per-individual mutation rate")
+    parser.add_argument('--patience', type=int, default=0, help="restart half the population after this many "
+                                                                 "generations without progress, 0 to never restart")
+    parser.add_argument('--generations', type=int, default=10000)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--cache', type=int, default=1 << 16, help="remembered genomes, 0 to score every guess")
+    args = parser.parse_args()
+
+    # the secret and the search get independent streams, or a shared seed would hand over the answer
+    secret_seed, search_seed = np.random.SeedSequence(args.seed).spawn(2)
+    oracle = PasswordOracle(args.length, ALPHABETS[args.alphabet], seed=secret_seed)
+    if args.cache:
+        oracle = CachedOracle(oracle, args.cache)
+    engine = GeneticEngine(oracle, args.population, args.mutation_rate, search_seed, args.selection, args.elitism,
+                           args.adaptive, args.patience)
+    start = time.perf_counter()
+    solved = engine.run(args.generations)
+    elapsed = time.perf_counter() - start
+    print(f"{'Solved' if solved else 'Gave up'} after {engine.generation} generations "
+          f"({engine.generation / elapsed:.0f}/s), best {engine.best}/{oracle.length}, "
+          f"{oracle.submissions} submissions, {oracle.queries} genomes scored, {engine.restarts} restarts")
@@ -0,0 +1,193 @@
+import argparse
+import queue
+import time
+import multiprocessing as mp
+import numpy as np
+from collections import namedtuple
+from password_oracle import PasswordOracle, CachedOracle, ALPHABETS
+from genetic_engine import GeneticEngine
+from selection import SELECTIONS
+
+IslandReport = namedtuple('IslandReport', 'island generation solved best genome submissions queries population')
+IslandResult = namedtuple('IslandResult', 'solved generations best genome submissions queries seconds diversity islands')
+
+
+def ring(islands):
+    return [[(i + 1) % islands] for i in range(islands)]
+
+
+def star(islands):
+    # island 0 is the hub: it hears from every island and sends its best back out to all of them
+    return [list(range(1, islands))] + [[0] for _ in range(1, islands)]
+
+
+def complete(islands):
+    return [[j for j in range(islands) if j != i] for i in range(islands)]
+
+
+TOPOLOGIES = {"ring": ring, "star": star, "complete": complete}
+
+
+def diversity(population):
+    # 0 when every individual is identical, approaching 1 when no allele dominates any position
+    population = np.atleast_2d(population)
+    top = np.array([np.bincount(column).max() for column in population.T])
+    return float(1 - top.mean() / len(population))
+
+
+def _receive(inbox, count, stop):
+    # a None in the inbox is a neighbour's farewell: it has finished and will send nothing more
+    arrived, departed = [], 0
+    while len(arrived) + departed < count:
+        try:
+            message = inbox.get(timeout=0.1)
+        except queue.Empty:
+            if stop.is_set():
+                return None, departed
+            continue
+        if message is None:
+            departed += 1
+        else:
+            arrived.append(message)
+    return arrived, departed
+
+
+def _island(index, secret, alphabet, settings, targets, sources, inboxes, results, stop, seed):
+    pop_size, mutation_rate, selection, elitism, interval, migrants, max_generations = settings
+    oracle = CachedOracle(PasswordOracle(len(secret), alphabet, secret))
+    engine = GeneticEngine(oracle, pop_size, mutation_rate, seed, selection, elitism)
+    inbox = inboxes[index]
+    try:
+        _evolve(engine, interval, migrants, max_generations, targets, sources, inbox, inboxes, stop)
+    finally:
+        # every message, the farewell included, is flushed before this process exits; the parent drains the
+        # inboxes while it waits, so a neighbour that stopped reading cannot leave this put blocked
+        for target in targets:
+            inboxes[target].put(None)
+    results.put(IslandReport(index, engine.generation, engine.solved, engine.best, engine.best_genome.tobytes(),
+                             oracle.submissions, oracle.queries, engine.population.tobytes()))
+
+
+def _evolve(engine, interval, migrants, max_generations, targets, sources, inbox, inboxes, stop):
+    while engine.generation < max_generations and not stop.is_set():
+        engine.evaluate()
+        if engine.solved:
+            stop.set()
+            return
+        if interval and engine.generation and engine.generation % interval == 0:
+            genomes, scores = engine.emigrants(migrants)
+            message = (genomes.tobytes(), scores.astype(np.int32).tobytes())
+            for target in targets:
+                inboxes[target].put(message)
+            arrived, departed = _receive(inbox, sources, stop)
+            sources -= departed
+            if arrived is None:
+                return
+            for genomes, scores in arrived:
+                engine.immigrate(np.frombuffer(genomes, dtype=np.uint8).reshape(-1, engine.length),
+                                 np.frombuffer(scores, dtype=np.int32))
+        engine.breed()
+
+
+class IslandModel:
+    def __init__(self, oracle, islands=4, pop_size=100, mutation_rate=0.5, interval=10, migrants=2,
+                 topology="ring", seed=None, selection="top-two", elitism=0):
+        if topology not in TOPOLOGIES:
+            raise ValueError(f"Topology must be one of {', '.join(TOPOLOGIES)}")
+        if not 0 < migrants < pop_size:
+            raise ValueError("Each island must keep some residents when migrants arrive")
+        self.oracle = oracle
+        self.islands = islands
+        self.pop_size = pop_size
+        self.mutation_rate = mutation_rate
+        self.interval = interval
+        self.migrants = migrants
+        self.topology = topology
+        self.selection = selection
+        self.elitism = elitism
+        self.seed = seed
+
+    def run(self, max_generations=10000):
+        # spawned workers start clean, so this is also safe to call from a GUI process
+        ctx = mp.get_context("spawn")
+        stop, results = ctx.Event(), ctx.Queue()
+        inboxes = [ctx.Queue() for _ in range(self.islands)]
+        targets = TOPOLOGIES[self.topology](self.islands) if self.islands > 1 else [[]]
+        sources = [sum(i in out for out in targets) for i in range(self.islands)]
+        settings = (self.pop_size, self.mutation_rate, self.selection, self.elitism, self.interval, self.migrants,
+                    max_generations)
+        seed = self.seed if isinstance(self.seed, np.random.SeedSequence) else np.random.SeedSequence(self.seed)
+        seeds = seed.spawn(self.islands)
+
+        start = time.perf_counter()
+        workers = [ctx.Process(target=_island, daemon=True,
+                               args=(i, self.oracle.secret, self.oracle.alphabet, settings, targets[i], sources[i],
+                                     inboxes, results, stop, seeds[i]))
+                   for i in range(self.islands)]
+        for worker in workers:
+            worker.start()
+        reports = []
+        while len(reports) < len(workers):
+            try:
+                reports.append(results.get(timeout=0.5))
+            except queue.Empty:
+                if any(worker.exitcode for worker in workers) or not any(worker.is_alive() for worker in workers):
+                    stop.set()
+                    raise RuntimeError("An island worker exited without reporting")
+        seconds = time.perf_counter() - start
+        while any(worker.is_alive() for worker in workers):
+            for inbox in inboxes:
+                try:
+                    while True:
+                        inbox.get_nowait()
+                except queue.Empty:
+                    pass
+            for worker in workers:
+                worker.join(timeout=0.05)
+
+        reports.sort(key=lambda report: report.island)
+        winner = max(reports, key=lambda report: (report.best, report.solved))
+        populations = [np.frombuffer(report.population, dtype=np.uint8).reshape(self.pop_size, -1)
+                       for report in reports]
+        return IslandResult(any(report.solved for report in reports), max(report.generation for report in reports),
+                            winner.best, self.oracle.decode(np.frombuffer(winner.genome, dtype=np.uint8)),
+                            sum(report.submissions for report in reports), sum(report.queries for report in reports),
+                            seconds,
+                            diversity(np.concatenate(populations)), reports)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evolve a password on several islands in parallel.")
+    parser.add_argument('--islands', type=int, default=4)
+    parser.add_argument('--population', type=int, default=100, help="individuals per island")
+    parser.add_argument('--length', type=int, default=32)
+    parser.add_argument('--alphabet', choices=sorted(ALPHABETS), default="lowercase")
+    parser.add_argument('--mutation-rate', type=float, default=0.5)
+    parser.add_argument('--selection', choices=sorted(SELECTIONS), default="top-two")
+    parser.add_argument('--elitism', type=int, default=0)
+    parser.add_argument('--interval', type=int, default=10, help="generations between migrations")
+    parser.add_argument('--migrants', type=int, default=2)
+    parser.add_argument('--topology', choices=sorted(TOPOLOGIES), default="ring")
+    parser.add_argument('--generations', type=int, default=10000)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--compare', action='store_true', help="also evolve one population of the same total size")
+    args = parser.parse_args()
+
+    secret_seed, search_seed = np.random.SeedSequence(args.seed).spawn(2)
+    oracle = PasswordOracle(args.length, ALPHABETS[args.alphabet], seed=secret_seed)
+    model = IslandModel(oracle, args.islands, args.population, args.mutation_rate, args.interval, args.migrants,
+                        args.topology, search_seed, args.selection, args.elitism)
+    result = model.run(args.generations)
+    print(f"islands: {'solved' if result.solved else 'gave up'} after {result.generations} generations in "
+          f"{result.seconds:.2f}s, best {result.best}/{args.length}, {result.submissions} submissions, "
+          f"{result.queries} genomes scored, "
+          f"diversity {result.diversity:.3f}")
+
+    if args.compare:
+        engine = GeneticEngine(oracle, args.islands * args.population, args.mutation_rate, search_seed,
+                               args.selection, args.elitism)
+        start = time.perf_counter()
+        solved = engine.run(args.generations)
+        print(f"single: {'solved' if solved else 'gave up'} after {engine.generation} generations in "
+              f"{time.perf_counter() - start:.2f}s, best {engine.best}/{args.length}, "
+              f"diversity {diversity(engine.population):.3f}")
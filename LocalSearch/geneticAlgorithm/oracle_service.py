@@ -0,0 +1,310 @@
+import os
+import time
+import struct
+import asyncio
+import argparse
+import tempfile
+import numpy as np
+from password_oracle import PasswordOracle, ALPHABETS
+from genetic_engine import GeneticEngine
+from selection import SELECTIONS
+
+# wire format: the server greets with HELLO and the alphabet, then answers every REQUEST (a genome count followed by
+# count * length symbol codes) with a STATUS byte and, when OK, one big-endian int32 score per genome
+HELLO = struct.Struct('!II')
+REQUEST = struct.Struct('!I')
+STATUS = struct.Struct('!B')
+OK, BUSY, BAD = range(3)
+
+
+class OracleServer:
+    # a local stand-in for the remote oracle: every batch waits out a simulated round trip and is turned away
+    # with BUSY once the token bucket (rate batches per second, at most burst at once) runs dry
+    def __init__(self, oracle, path, latency=0.05, jitter=0.0, rate=0.0, burst=1, seed=None):
+        self.oracle = oracle
+        self.path = path
+        self.latency = latency
+        self.jitter = jitter
+        self.rate = rate
+        self.burst = burst
+        self.rng = np.random.default_rng(seed)
+        self.tokens = burst
+        self.stamp = time.monotonic()
+        self.served = 0
+        self.rejected = 0
+        self.active = 0
+        self.peak = 0
+        self.server = None
+
+    def admit(self):
+        if not self.rate:
+            return True
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+    async def start(self):
+        self.server = await asyncio.start_unix_server(self.handle, path=self.path)
+        return self
+
+    async def close(self):
+        self.server.close()
+        await self.server.wait_closed()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    async def handle(self, reader, writer):
+        length, alphabet = self.oracle.length, self.oracle.alphabet.encode()
+        writer.write(HELLO.pack(length, len(alphabet)) + alphabet)
+        try:
+            while True:
+                try:
+                    (count,) = REQUEST.unpack(await reader.readexactly(REQUEST.size))
+                    payload = await reader.readexactly(count * length)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+                try:
+                    await asyncio.sleep(self.latency + self.jitter * self.rng.random())
+                    genomes = np.frombuffer(payload, dtype=np.uint8).reshape(count, length)
+                    if not count or genomes.max() >= len(alphabet):
+                        writer.write(STATUS.pack(BAD))
+                    elif not self.admit():
+                        self.rejected += 1
+                        writer.write(STATUS.pack(BUSY))
+                    else:
+                        self.served += 1
+                        writer.write(STATUS.pack(OK) + self.oracle.score(genomes).astype('>i4').tobytes())
+                    await writer.drain()
+                except ConnectionError:
+                    # the client gave up on this request and hung up
+                    break
+                finally:
+                    self.active -= 1
+        finally:
+            writer.close()
+
+
+class AsyncOracle:
+    # scores a whole batch per request; the pool holds `concurrency` connections, one request each, so taking a
+    # connection from it is what limits how many batches are in flight
+    def __init__(self, path, concurrency=4, retries=8, backoff=0.01):
+        if concurrency < 1:
+            raise ValueError("At least one request must be allowed in flight")
+        self.path = path
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.pool = None
+        self.submissions = 0
+        self.queries = 0
+        self.throttled = 0
+
+    async def open(self):
+        reader, writer = await asyncio.open_unix_connection(self.path)
+        length, size = HELLO.unpack(await reader.readexactly(HELLO.size))
+        self.length, self.alphabet = length, (await reader.readexactly(size)).decode()
+        return reader, writer
+
+    async def connect(self):
+        self.pool = asyncio.Queue()
+        for _ in range(self.concurrency):
+            self.pool.put_nowait(await self.open())
+        self.symbols = np.array(list(self.alphabet))
+        self.lookup = {char: code for code, char in enumerate(self.alphabet)}
+        return self
+
+    async def close(self):
+        while not self.pool.empty():
+            connection = self.pool.get_nowait()
+            if connection is not None:
+                connection[1].close()
+                await connection[1].wait_closed()
+
+    async def __aenter__(self):
+        return await self.connect()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def encode(self, text):
+        if len(text) != self.length or any(char not in self.lookup for char in text):
+            raise ValueError(f"Guesses must be {self.length} characters from the alphabet")
+        return np.array([self.lookup[char] for char in text], dtype=np.uint8)
+
+    def decode(self, genome):
+        return ''.join(self.symbols[genome])
+
+    async def score(self, population):
+        population = np.ascontiguousarray(np.atleast_2d(population), dtype=np.uint8)
+        connection = await self.pool.get()
+        clean = False
+        try:
+            if connection is None:
+                connection = await self.open()
+            reader, writer = connection
+            for attempt in range(self.retries + 1):
+                writer.write(REQUEST.pack(len(population)) + population.tobytes())
+                await writer.drain()
+                (status,) = STATUS.unpack(await reader.readexactly(STATUS.size))
+                if status == OK:
+                    scores = np.frombuffer(await reader.readexactly(4 * len(population)), dtype='>i4')
+                    self.submissions += 1
+                    self.queries += len(population)
+                    clean = True
+                    return scores.astype(np.int64)
+                if status == BAD:
+                    clean = True
+                    raise ValueError("The oracle rejected a malformed batch")
+                self.throttled += 1
+                await asyncio.sleep(self.backoff * 2 ** attempt)
+            clean = True
+            raise RuntimeError(f"Still rate limited after {self.retries} retries")
+        finally:
+            # a request abandoned halfway leaves an unread answer on its connection, so that connection is retired
+            # and the next request through this slot opens a fresh one
+            if not clean and connection is not None:
+                connection[1].close()
+            self.pool.put_nowait(connection if clean else None)
+
+
+class PipelinedEvolution:
+    # keeps up to in_flight batches at the oracle and breeds the next one as soon as a slot frees, so breeding
+    # overlaps the round trips instead of waiting on them
+    def __init__(self, engine, oracle, in_flight=2):
+        if in_flight < 1:
+            raise ValueError("At least one batch must be in flight")
+        self.engine = engine
+        self.oracle = oracle
+        self.in_flight = in_flight
+        # population, origins, rates and fitness of the scored individuals the next batch is bred from
+        self.pool = None
+        self.version = 0
+        self.batches = 0
+        self.best = 0
+        self.best_genome = None
+        self.history = []
+
+    @property
+    def solved(self):
+        return self.best == self.engine.length
+
+    def breed(self):
+        engine = self.engine
+        if self.pool is None:
+            # nothing has been scored yet, so every free slot gets a fresh random population
+            engine.randomize()
+        else:
+            engine.population, engine.origins, engine.rates, engine.fitness = (part.copy() for part in self.pool)
+            engine.breed()
+        return engine.population.copy(), engine.origins.copy(), engine.rates.copy()
+
+    def merge(self, population, origins, rates, fitness, version):
+        engine = self.engine
+        top = int(np.argmax(fitness))
+        if self.best_genome is None or fitness[top] > self.best:
+            self.best, self.best_genome = int(fitness[top]), population[top].copy()
+            engine.improved_at = engine.generation
+        self.history.append(int(fitness[top]))
+        self.batches += 1
+        if version != self.version:
+            # bred from an older pool than the current one, so the batch competes with the current pool instead of
+            # replacing it; newcomers go first so that ties favour them and plateaus are still walked
+            population, origins, rates, fitness = (np.concatenate([new, old]) for new, old in
+                                                   zip((population, origins, rates, fitness), self.pool))
+        keep = np.argsort(-fitness, kind='stable')[:engine.pop_size]
+        self.pool = (population[keep], origins[keep], rates[keep], fitness[keep])
+        self.version += 1
+
+    async def run(self, max_batches=10000):
+        pending = {}
+        bred = 0
+        while not self.solved and (pending or bred < max_batches):
+            while len(pending) < self.in_flight and bred < max_batches and not self.solved:
+                population, origins, rates = self.breed()
+                task = asyncio.ensure_future(self.oracle.score(population))
+                pending[task] = (population, origins, rates, self.version)
+                bred += 1
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                population, origins, rates, version = pending.pop(task)
+                self.merge(population, origins, rates, task.result(), version)
+        # batches still in flight are already paid for, so their answers are collected rather than abandoned
+        for task, (population, origins, rates, version) in pending.items():
+            self.merge(population, origins, rates, await task, version)
+        return self.solved
+
+
+async def measure(args, concurrency, seed):
+    secret_seed, search_seed = np.random.SeedSequence(seed).spawn(2)
+    oracle = PasswordOracle(args.length, ALPHABETS[args.alphabet], seed=secret_seed)
+    path = os.path.join(tempfile.mkdtemp(), "oracle.sock")
+    server = await OracleServer(oracle, path, args.latency, args.jitter, args.rate, args.burst, seed).start()
+    try:
+        async with AsyncOracle(path, concurrency) as remote:
+            engine = GeneticEngine(remote, args.population, args.mutation_rate, search_seed, args.selection,
+                                   args.elitism, args.adaptive)
+            evolution = PipelinedEvolution(engine, remote, concurrency)
+            start = time.perf_counter()
+            solved = await evolution.run(args.batches)
+            seconds = time.perf_counter() - start
+    finally:
+        await server.close()
+        os.rmdir(os.path.dirname(path))
+    return solved, evolution.batches, remote.queries, remote.throttled, server.peak, seconds
+
+
+async def benchmark(args):
+    print(f"{'in flight':>9}{'solved':>8}{'batches p50':>13}{'seconds p50':>13}{'batches/s':>11}{'genomes/s':>11}"
+          f"{'throttled':>11}{'peak':>6}")
+    for concurrency in args.concurrency:
+        runs = [await measure(args, concurrency, seed) for seed in range(args.seeds)]
+        solved, batches, queries, throttled, peak, seconds = (np.array(column) for column in zip(*runs))
+        print(f"{concurrency:>9}{solved.sum():>8}{np.median(batches):>13.0f}{np.median(seconds):>13.2f}"
+              f"{batches.sum() / seconds.sum():>11.1f}{queries.sum() / seconds.sum():>11.0f}"
+              f"{throttled.sum():>11}{peak.max():>6}")
+
+
+async def serve(args):
+    oracle = PasswordOracle(args.length, ALPHABETS[args.alphabet], seed=args.seed)
+    server = await OracleServer(oracle, args.socket, args.latency, args.jitter, args.rate, args.burst).start()
+    print(f"Serving {args.length}-character passwords on {args.socket}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+        print(f"{server.served} batches served, {server.rejected} rate limited, peak {server.peak} in flight")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the password oracle over a Unix socket with simulated "
+                                                 "latency and rate limits, or measure GA throughput against it.")
+    parser.add_argument('mode', choices=["bench", "serve"])
+    parser.add_argument('--socket', default=os.path.join(tempfile.gettempdir(), "password_oracle.sock"),
+                        help="where serve listens")
+    parser.add_argument('--latency', type=float, default=0.05, help="seconds added to every batch")
+    parser.add_argument('--jitter', type=float, default=0.0, help="up to this many extra seconds per batch")
+    parser.add_argument('--rate', type=float, default=0.0, help="batches per second before BUSY, 0 for no limit")
+    parser.add_argument('--burst', type=int, default=1, help="batches the rate limit lets through at once")
+    parser.add_argument('--length', type=int, default=16)
+    parser.add_argument('--alphabet', choices=sorted(ALPHABETS), default="lowercase")
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 2, 4, 8], help="batches in flight")
+    parser.add_argument('--population', type=int, default=50)
+    parser.add_argument('--mutation-rate', type=float, default=0.5)
+    parser.add_argument('--selection', choices=sorted(SELECTIONS), default="tournament")
+    parser.add_argument('--elitism', type=int, default=1)
+    parser.add_argument('--adaptive', action='store_true')
+    parser.add_argument('--batches', type=int, default=2000, help="give up after breeding this many batches")
+    parser.add_argument('-n', '--seeds', type=int, default=3)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(benchmark(args) if args.mode == "bench" else serve(args))
+    except KeyboardInterrupt:
+        pass
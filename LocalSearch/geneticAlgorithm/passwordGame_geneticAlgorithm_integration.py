@@ -1,13 +1,28 @@
+import argparse
+import os
+import threading
 import tkinter as tk
-import random
-import string
+import numpy as np
+from password_oracle import PasswordOracle, CachedOracle, ALPHABETS
+from genetic_engine import GeneticEngine, RANDOM
+from selection import SELECTIONS
+from island_model import IslandModel
+
+ORIGIN_TAGS = ("random", "parent1", "parent2", "mutation", "elite")
+ORIGIN_COLORS = ("black", "green", "red", "#0b0fde", "#8e44ad")
+REFRESH_MS = 16
 
 
 class PasswordGame:
-    def __init__(self, root):
+    def __init__(self, root, pop_size=7, length=6, alphabet=ALPHABETS["lowercase"], display_rows=7):
         self.root = root
+        self.pop_size = pop_size
+        self.length = length
+        self.alphabet = alphabet
+        # large populations are only ever shown through their first few rows, which are a fair sample
+        self.display_rows = min(display_rows, pop_size)
         self.root.title("Password Guessing Game")
-        self.root.geometry("600x600")  # Increased height to accommodate new labels
+        self.root.geometry(f"{max(600, 10 * length + 340)}x600")  # Increased height to accommodate new labels
         self.root.configure(bg="#2c3e50")
 
         self.play_again_button = tk.Button(root, text="Play Again", font=("Arial", 10, "bold"), bg="#e74c3c", fg="white",
@@ -17,16 +32,19 @@ class PasswordGame:
         self.initialize_game()
 
     def initialize_game(self):
-        self.password = ''.join(random.choices(string.ascii_lowercase, k=6))
+        # repeated guesses are answered from the cache and never count as submissions
+        self.oracle = CachedOracle(PasswordOracle(self.length, self.alphabet))
+        self.password = self.oracle.secret
         print(self.password)  # Debugging
         self.best_guess = 0
-        self.submission_count = 0
         self.auto_running = False
+        self.settings_lock = threading.Lock()
+        self.pending_settings = None
 
         self.custom_font = ("Arial", 12)
 
         # Header
-        tk.Label(self.root, text="Guess the 6-character password:", font=("Arial", 14, "bold"),
+        tk.Label(self.root, text=f"Guess the {self.length}-character password:", font=("Arial", 14, "bold"),
                  bg="#2c3e50", fg="white").pack(pady=10)
 
         # Parent Labels
@@ -47,12 +65,14 @@ class PasswordGame:
         self.guess_frame.pack(side=tk.LEFT, padx=20)
 
         self.text_widgets, self.results = [], []
-        for _ in range(7):
+        for _ in range(self.display_rows):
             frame = tk.Frame(self.guess_frame, bg="#2c3e50")
             frame.pack(pady=5)
 
-            text_widget = tk.Text(frame, font=self.custom_font, width=10, height=1, bg="#ecf0f1", fg="black", bd=2, relief=tk.FLAT)
+            text_widget = tk.Text(frame, font=self.custom_font, width=max(10, self.length + 2), height=1, bg="#ecf0f1", fg="black", bd=2, relief=tk.FLAT)
             text_widget.pack(side=tk.LEFT, padx=5)
+            for tag, color in zip(ORIGIN_TAGS, ORIGIN_COLORS):
+                text_widget.tag_config(tag, foreground=color)
             self.text_widgets.append(text_widget)
 
             result_label = tk.Label(frame, text="", font=self.custom_font, bg="#2c3e50", fg="white")
@@ -70,6 +90,14 @@ class PasswordGame:
         self.submission_label = tk.Label(self.bar_frame, text="Submissions: 0", font=self.custom_font, bg="#2c3e50", fg="white")
         self.submission_label.pack(pady=10)
 
+        self.cache_label = tk.Label(self.bar_frame, text="Cache hits: 0", font=self.custom_font, bg="#2c3e50",
+                                    fg="white")
+        self.cache_label.pack(pady=10)
+
+        self.population_label = tk.Label(self.bar_frame, text=f"Showing {self.display_rows} of {self.pop_size}",
+                                         font=self.custom_font, bg="#2c3e50", fg="white")
+        self.population_label.pack(pady=10)
+
         # Buttons
         self.submit_frame = tk.Frame(self.root, bg="#2c3e50")
         self.submit_frame.pack(pady=10)
@@ -87,6 +115,11 @@ class PasswordGame:
                                          fg="white", selectcolor="#2c3e50", variable=self.auto_var, command=self.toggle_auto)
         self.auto_check.pack(side=tk.LEFT)
 
+        self.islands_button = tk.Button(self.submit_frame, text="Islands", font=("Arial", 12, "bold"), bg="#2ecc71",
+                                        fg="white", bd=0, activebackground="#27ae60", command=self.run_islands)
+        self.islands_button.pack(side=tk.LEFT, padx=10)
+        self.island_result = None
+
         # Mutation Rate Slider
         self.mutation_rate_slider = tk.Scale(self.root, from_=0, to=1, resolution=0.01, orient=tk.HORIZONTAL,
                                              label="Mutation Rate", font=self.custom_font, length=300, bg="#34495e",
@@ -98,167 +131,267 @@ class PasswordGame:
                                        font=self.custom_font, bg="#2c3e50", fg="white")
         self.mutation_label.pack(pady=10)
 
+        self.selection_frame = tk.Frame(self.root, bg="#2c3e50")
+        self.selection_frame.pack()
+        tk.Label(self.selection_frame, text="Selection:", font=self.custom_font, bg="#2c3e50",
+                 fg="white").pack(side=tk.LEFT)
+        self.selection_var = tk.StringVar(value="top-two")
+        self.selection_menu = tk.OptionMenu(self.selection_frame, self.selection_var, *SELECTIONS)
+        self.selection_menu.pack(side=tk.LEFT, padx=10)
+        tk.Label(self.selection_frame, text="Elitism:", font=self.custom_font, bg="#2c3e50",
+                 fg="white").pack(side=tk.LEFT)
+        self.elitism_spinbox = tk.Spinbox(self.selection_frame, from_=0, to=self.pop_size - 1, width=5,
+                                          font=self.custom_font)
+        self.elitism_spinbox.pack(side=tk.LEFT, padx=10)
+
+        self.adaptive_var = tk.BooleanVar()
+        self.adaptive_check = tk.Checkbutton(self.selection_frame, text="Adaptive", font=self.custom_font,
+                                             bg="#2c3e50", fg="white", selectcolor="#2c3e50",
+                                             variable=self.adaptive_var)
+        self.adaptive_check.pack(side=tk.LEFT)
+        tk.Label(self.selection_frame, text="Restart after:", font=self.custom_font, bg="#2c3e50",
+                 fg="white").pack(side=tk.LEFT)
+        self.patience_spinbox = tk.Spinbox(self.selection_frame, from_=0, to=1000, width=5, font=self.custom_font)
+        self.patience_spinbox.pack(side=tk.LEFT, padx=10)
+
         self.excellent_label = tk.Label(self.root, text="", font=("Arial", 16, "bold"), bg="#2c3e50", fg="#2ecc71")
         self.excellent_label.pack(pady=10)
 
-        # Initialize character origins
-        self.character_origins = [[None for _ in range(6)] for _ in range(7)]  # Track character origins
-        
+        # the engine owns the population; the widgets only show its latest snapshot
+        self.engine = GeneticEngine(self.oracle, self.pop_size, self.mutation_rate_slider.get())
+        self.shown = [("", b"")] * len(self.text_widgets)
+        self.drawn = {}
+        self.worker = None
+        self.latest = None
+        self.drawn_snapshot = None
         self.random_population()
 
     def submit(self):
         self.check_guesses()
-        if self.auto_running:
-            self.genetic_algorithm()
-        if self.auto_running:
-            self.root.after(40, self.submit)  # Auto-submit every 0.04 sec
 
     def check_guesses(self):
-        self.submission_count += 1
-        self.submission_label.config(text=f"Submissions: {self.submission_count}")
-        self.excellent_label.config(text="")
-
-        # Reset all text widget backgrounds to default
-        for text_widget in self.text_widgets:
-            text_widget.config(bg="#ecf0f1")  # Default background color
-
-        # Calculate correctness for each guess
-        correctness_scores = []
+        valid = self.read_guesses()
+        fitness = self.engine.evaluate()
+        fitness[:self.display_rows][~valid] = -1  # Invalid guesses get a score of -1
+        self.show_results(self.engine.snapshot(self.display_rows))
+
+    def show_results(self, snapshot):
+        self.update_widget(self.submission_label, text=f"Submissions: {self.oracle.submissions}")
+        self.update_widget(self.cache_label, text=f"Cache hits: {self.oracle.hits}   Restarts: {self.engine.restarts}")
+
+        length = self.oracle.length
+        for result, correct in zip(self.results, snapshot.fitness.tolist()):
+            if correct < 0:
+                self.update_widget(result, text="Invalid", fg="#e74c3c")
+            else:
+                self.update_widget(result, text=f"{correct}/{length}", fg="white")
+
+        if snapshot.best > self.best_guess:
+            self.best_guess = snapshot.best
+            self.update_bar()
+
+        # Highlight the fittest entry in green and the runner-up in red, if they are on screen
+        colors = ["#ecf0f1"] * len(self.text_widgets)  # Default background color
+        if self.best_guess < length:
+            for index, color in zip(snapshot.leaders.tolist(), ("#2ecc71", "#e74c3c")):
+                if index < self.display_rows:
+                    colors[index] = color
+        for text_widget, color in zip(self.text_widgets, colors):
+            self.update_widget(text_widget, bg=color)
+
+        if self.best_guess == length:
+            self.update_widget(self.excellent_label, text="Excellent!", fg="#2ecc71")
+            self.submit_button.config(state=tk.DISABLED)
+            self.auto_running = False
+        else:
+            self.update_widget(self.excellent_label, text="")
+
+    def read_guesses(self):
+        # a guess edited by hand replaces its individual before the population is scored
+        valid = np.ones(len(self.text_widgets), dtype=bool)
         for i, text_widget in enumerate(self.text_widgets):
             guess = text_widget.get("1.0", tk.END).strip()
-            if len(guess) != 6:
-                self.results[i].config(text="Invalid", fg="#e74c3c")
-                correctness_scores.append(-1)  # Invalid guesses get a score of -1
+            if guess == self.shown[i][0]:
                 continue
+            try:
+                self.engine.population[i] = self.oracle.encode(guess)
+                self.engine.origins[i] = RANDOM
+                # the typed text carries no origin colours, so the next snapshot always redraws this row
+                self.shown[i] = (guess, None)
+            except ValueError:
+                valid[i] = False
+        return valid
 
-            correct = sum(1 for j in range(6) if guess[j] == self.password[j])
-            self.results[i].config(text=f"{correct}/6", fg="white")
-            correctness_scores.append(correct)
-
-            if correct > self.best_guess:
-                self.best_guess = correct
-                self.update_bar()
-
-            if guess == self.password:
-                self.excellent_label.config(text="Excellent!", fg="#2ecc71")
-                self.submit_button.config(state=tk.DISABLED)
-                self.auto_running = False
-                return
-
-        # Find the indices of the first and second max scores
-        if len(correctness_scores) >= 2:
-            sorted_indices = sorted(range(len(correctness_scores)), key=lambda i: correctness_scores[i], reverse=True)
-            first_max_index = sorted_indices[0]
-            second_max_index = sorted_indices[1]
+    def random_population(self):
+        self.engine.randomize()
+        self.show_population(self.engine.snapshot(self.display_rows))
 
-            # Highlight the first max entry in green
-            self.text_widgets[first_max_index].config(bg="#2ecc71")  # Green
-            # Highlight the second max entry in red
-            self.text_widgets[second_max_index].config(bg="#e74c3c")  # Red
+    def read_settings(self):
+        try:
+            patience = max(int(self.patience_spinbox.get()), 0)
+        except ValueError:
+            patience = 0
+        return {"mutation_rate": self.mutation_rate_slider.get(), "selection": self.selection_var.get(),
+                "elitism": self.elitism(), "adaptive": self.adaptive_var.get(), "patience": patience}
 
-        # Color characters based on their origin
-        self.color_characters()
-
-    def random_population(self):
-        for i, text_widget in enumerate(self.text_widgets):
-            text_widget.delete("1.0", tk.END)
-            random_guess = ''.join(random.choices(string.ascii_lowercase, k=6))
-            text_widget.insert("1.0", random_guess)
-            for j in range(6):
-                self.character_origins[i][j] = "random"  # Mark as random
+    def apply_settings(self, settings=None):
+        for name, value in (settings or self.read_settings()).items():
+            setattr(self.engine, name, value)
 
     def genetic_algorithm(self):
-        population = [text_widget.get("1.0", tk.END).strip() for text_widget in self.text_widgets]
-        fitness = [int(result.cget("text").split('/')[0]) for result in self.results]
-        if all(fit == 0 for fit in fitness):
-            self.random_population()
+        if self.engine.fitness is None:
+            self.check_guesses()
+        if self.engine.solved:
             return
-        
-        def select_parent():
-            pick = max(fitness)
-            parent = population[fitness.index(pick)]
-            fitness[fitness.index(pick)] = 0
-            return parent, pick
-
-        parent1, fit1 = select_parent()
-        parent2, fit2 = select_parent()
-
-        # Update parent labels
-        self.parent1_label.config(text=f"Parent 1: {parent1}")
-        self.parent2_label.config(text=f"Parent 2: {parent2}")
-
-        new_population = []
-        for i in range(7):
-            s = ""
-            for j in range(6):
-                if random.random() < fit1 / (fit1 + fit2):
-                    s += parent1[j]
-                    self.character_origins[i][j] = "parent1"  # Track origin
-                else:
-                    s += parent2[j]
-                    self.character_origins[i][j] = "parent2"  # Track origin
-            new_population.append(s)
-
-        mutation_rate = self.mutation_rate_slider.get()
-        for i in range(len(new_population)):
-            if random.random() < mutation_rate:
-                mutate_point = random.randint(0, 5)
-                new_population[i] = new_population[i][:mutate_point] + random.choice(string.ascii_lowercase) + new_population[i][mutate_point + 1:]
-                self.character_origins[i][mutate_point] = "mutation"  # Track origin
-
-        for text_widget, new_individual in zip(self.text_widgets, new_population):
-            text_widget.delete("1.0", tk.END)
-            text_widget.insert("1.0", new_individual)
-
-        # Color characters based on their origin
-        self.color_characters()
-
-    def color_characters(self):
+        self.apply_settings()
+        self.engine.breed()
+        self.show_population(self.engine.snapshot(self.display_rows))
+
+    def show_population(self, snapshot):
+        if snapshot.parents is not None:
+            parent1, parent2 = (self.oracle.decode(parent) for parent in snapshot.parents)
+            self.update_widget(self.parent1_label, text=f"Parent 1: {parent1}")
+            self.update_widget(self.parent2_label, text=f"Parent 2: {parent2}")
         for i, text_widget in enumerate(self.text_widgets):
-            text_widget.tag_remove("parent1", "1.0", tk.END)
-            text_widget.tag_remove("parent2", "1.0", tk.END)
-            text_widget.tag_remove("mutation", "1.0", tk.END)
-            text_widget.tag_remove("random", "1.0", tk.END)
-
-            text = text_widget.get("1.0", tk.END).strip()
-            for j in range(len(text)):
-                origin = self.character_origins[i][j]
-                if origin == "parent1":
-                    text_widget.tag_add("parent1", f"1.{j}", f"1.{j + 1}")
-                    text_widget.tag_config("parent1", foreground="green")
-                elif origin == "parent2":
-                    text_widget.tag_add("parent2", f"1.{j}", f"1.{j + 1}")
-                    text_widget.tag_config("parent2", foreground="red")
-                elif origin == "mutation":
-                    text_widget.tag_add("mutation", f"1.{j}", f"1.{j + 1}")
-                    text_widget.tag_config("mutation", foreground="#0b0fde")
-                else:
-                    text_widget.tag_add("random", f"1.{j}", f"1.{j + 1}")
-                    text_widget.tag_config("random", foreground="black")
+            guess, origins = self.oracle.decode(snapshot.population[i]), snapshot.origins[i].tobytes()
+            if (guess, origins) == self.shown[i]:
+                continue
+            text_widget.delete("1.0", tk.END)
+            text_widget.insert("1.0", guess)
+            self.shown[i] = (guess, origins)
+            self.color_characters(text_widget, snapshot.origins[i])
+
+    def color_characters(self, text_widget, origins):
+        # Color characters based on their origin, one tag per run of equal origins
+        for tag in ORIGIN_TAGS:
+            text_widget.tag_remove(tag, "1.0", tk.END)
+        breaks = np.flatnonzero(np.diff(origins)) + 1
+        for start, stop in zip(np.r_[0, breaks].tolist(), np.r_[breaks, len(origins)].tolist()):
+            text_widget.tag_add(ORIGIN_TAGS[origins[start]], f"1.{start}", f"1.{stop}")
+
+    def update_widget(self, widget, **options):
+        # every config call costs a Tk round trip and a redraw, so only changed options are sent
+        changed = {key: value for key, value in options.items() if self.drawn.get((widget, key)) != value}
+        if changed:
+            widget.config(**changed)
+            for key, value in changed.items():
+                self.drawn[(widget, key)] = value
+
+    def evolve(self):
+        # runs on the worker thread; the Tk thread only ever reads the published snapshot
+        engine = self.engine
+        while True:
+            engine.evaluate()
+            self.latest = engine.snapshot(self.display_rows)
+            if engine.solved or not self.auto_running:
+                break
+            # settings changed in the window take effect between generations, never halfway through a breed
+            with self.settings_lock:
+                settings, self.pending_settings = self.pending_settings, None
+            if settings:
+                self.apply_settings(settings)
+            engine.breed()
+
+    def poll_evolution(self):
+        snapshot = self.latest
+        if snapshot is not None and snapshot is not self.drawn_snapshot:
+            self.drawn_snapshot = snapshot
+            self.show_population(snapshot)
+            self.show_results(snapshot)
+        if self.worker.is_alive():
+            with self.settings_lock:
+                self.pending_settings = self.read_settings()
+            self.root.after(REFRESH_MS, self.poll_evolution)
+            return
+        self.auto_running = False
+        self.auto_var.set(False)
+        self.next_population_button.config(state=tk.NORMAL)
+        self.islands_button.config(state=tk.NORMAL)
+        if not self.engine.solved:
+            self.submit_button.config(state=tk.NORMAL)
+
+    def elitism(self):
+        try:
+            return min(max(int(self.elitism_spinbox.get()), 0), self.pop_size - 1)
+        except ValueError:
+            return 0
 
     def update_bar(self):
-        bar_height = (self.best_guess / 6) * 300
+        progress = self.best_guess / self.oracle.length
+        bar_height = progress * 300
         self.bar_canvas.coords(self.bar, 5, 300 - bar_height, 25, 300)
 
-        red, green = int(255 * (1 - self.best_guess / 6)), int(255 * (self.best_guess / 6))
+        red, green = int(255 * (1 - progress)), int(255 * progress)
         self.bar_canvas.itemconfig(self.bar, fill=f"#{red:02x}{green:02x}00")
 
     def update_mutation_label(self, _=None):
         self.mutation_label.config(text=f"Mutation Rate: {self.mutation_rate_slider.get():.2f}")
 
+    def run_islands(self):
+        # the islands are separate processes; a helper thread waits on them so the window stays responsive
+        self.islands_button.config(state=tk.DISABLED)
+        self.update_widget(self.excellent_label, text="Islands evolving...", fg="white")
+        model = IslandModel(self.oracle, islands=max(2, min(4, os.cpu_count() or 1)), pop_size=max(self.pop_size, 10),
+                            mutation_rate=self.mutation_rate_slider.get(), selection=self.selection_var.get(),
+                            elitism=min(self.elitism(), 9))
+        self.island_result = None
+
+        def work():
+            try:
+                self.island_result = model.run()
+            except Exception as error:
+                self.island_result = error
+        threading.Thread(target=work, daemon=True).start()
+        self.root.after(100, self.poll_islands)
+
+    def poll_islands(self):
+        result = self.island_result
+        if result is None:
+            self.root.after(100, self.poll_islands)
+            return
+        self.islands_button.config(state=tk.NORMAL)
+        if isinstance(result, Exception):
+            self.update_widget(self.excellent_label, text=f"Islands failed: {result}", fg="#e74c3c")
+            return
+        self.update_widget(self.parent1_label, text=f"Islands best: {result.genome}")
+        self.update_widget(self.parent2_label, text=f"Diversity: {result.diversity:.2f}")
+        self.update_widget(self.excellent_label,
+                           text=f"{len(result.islands)} islands: {result.best}/{self.oracle.length} after "
+                                f"{result.generations} generations, {result.submissions} submissions",
+                           fg="#2ecc71" if result.solved else "white")
+        if result.best > self.best_guess:
+            self.best_guess = result.best
+            self.update_bar()
+
     def toggle_auto(self):
         self.auto_running = self.auto_var.get()
-        if self.auto_running:
-            self.submit()
+        if not self.auto_running or (self.worker is not None and self.worker.is_alive()):
+            return
+        # evolution runs flat out on a worker thread while the window redraws at the display refresh rate
+        self.apply_settings()
+        self.pending_settings = None
+        for button in (self.submit_button, self.next_population_button, self.islands_button):
+            button.config(state=tk.DISABLED)
+        self.latest = None
+        self.worker = threading.Thread(target=self.evolve, daemon=True)
+        self.worker.start()
+        self.root.after(REFRESH_MS, self.poll_evolution)
 
     def reset_game(self):
         self.root.destroy()  # Close the current window
         root = tk.Tk()  # Create a new instance
-        PasswordGame(root)
+        PasswordGame(root, self.pop_size, self.length, self.alphabet, self.display_rows)
         root.mainloop()
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Watch a genetic algorithm guess a password.")
+    parser.add_argument('--population', type=int, default=7)
+    parser.add_argument('--length', type=int, default=6)
+    parser.add_argument('--alphabet', choices=sorted(ALPHABETS), default="lowercase")
+    parser.add_argument('--rows', type=int, default=7, help="individuals shown on screen")
+    args = parser.parse_args()
+
     root = tk.Tk()
-    game = PasswordGame(root)
+    game = PasswordGame(root, args.population, args.length, ALPHABETS[args.alphabet], args.rows)
     root.mainloop()
\ No newline at end of file
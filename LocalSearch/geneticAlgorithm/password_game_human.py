@@ -2,6 +2,8 @@ import tkinter as tk
 from tkinter import messagebox
 import random
 import string
+from password_oracle import PasswordOracle
+from password_solver import PasswordSolver
 
 class PasswordGame:
     def __init__(self, root):
@@ -86,9 +88,13 @@ class PasswordGame:
         )
         self.submission_label.pack(pady=10)
 
+        # Frame for buttons
+        self.button_frame = tk.Frame(root, bg="#2c3e50")
+        self.button_frame.pack(pady=20)
+
         # Submit button
         self.submit_button = tk.Button(
-            root,
+            self.button_frame,
             text="Submit",
             font=("Arial", 12, "bold"),
             bg="#2ecc71",
@@ -98,7 +104,22 @@ class PasswordGame:
             activeforeground="white",
             command=self.submit
         )
-        self.submit_button.pack(pady=20)
+        self.submit_button.pack(side=tk.LEFT, padx=10)
+
+        # Solve button: plays the planned-batch solver through the same board
+        self.solve_button = tk.Button(
+            self.button_frame,
+            text="Solve",
+            font=("Arial", 12, "bold"),
+            bg="#3498db",
+            fg="white",
+            bd=0,
+            activebackground="#2980b9",
+            activeforeground="white",
+            command=self.solve
+        )
+        self.solve_button.pack(side=tk.LEFT, padx=10)
+        self.solver = None
 
         # Excellent label
         self.excellent_label = tk.Label(
@@ -127,6 +148,9 @@ class PasswordGame:
         # Check each guess
         for i in range(7):
             guess = self.entries[i].get().strip()
+            if not guess:
+                self.results[i].config(text="")
+                continue
             if len(guess) != 6:
                 self.results[i].config(text="Invalid", fg="#e74c3c")
                 continue
@@ -150,6 +174,26 @@ class PasswordGame:
                 self.submit_button.config(state=tk.DISABLED)
                 return
     
+    def solve(self):
+        self.submit_button.config(state=tk.DISABLED)
+        self.solve_button.config(state=tk.DISABLED)
+        self.solver = PasswordSolver(PasswordOracle(6, string.ascii_lowercase, self.password), batch_size=7)
+        self.root.after(500, self.solve_step)
+
+    def solve_step(self):
+        # the solver's batch is written into the entries and scored like a human submission
+        genomes, _ = self.solver.step()
+        for i, entry in enumerate(self.entries):
+            entry.delete(0, tk.END)
+            self.results[i].config(text="")
+            if i < len(genomes):
+                entry.insert(0, self.solver.oracle.decode(genomes[i]))
+        self.check_guesses()
+        if self.solver.solved:
+            self.excellent_label.config(text=f"Solved in {self.submission_count} submissions!", fg="#2ecc71")
+        else:
+            self.root.after(500, self.solve_step)
+
     def update_bar(self):
         # Calculate the height of the bar based on the best guess
         bar_height = (self.best_guess / 6) * 300  # Scale to canvas height
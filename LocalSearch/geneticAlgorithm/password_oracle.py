@@ -0,0 +1,101 @@
+import string
+import numpy as np
+from collections import OrderedDict
+
+ALPHABETS = {
+    "lowercase": string.ascii_lowercase,
+    "letters": string.ascii_letters,
+    "alphanumeric": string.ascii_letters + string.digits,
+    "printable": string.ascii_letters + string.digits + string.punctuation,
+}
+
+
+class PasswordOracle:
+    def __init__(self, length=6, alphabet=ALPHABETS["lowercase"], secret=None, seed=None):
+        if not 1 < len(alphabet) <= 256 or len(set(alphabet)) != len(alphabet):
+            raise ValueError("The alphabet needs 2 to 256 distinct characters")
+        self.alphabet = alphabet
+        self.length = length
+        self.symbols = np.array(list(alphabet))
+        self.lookup = {char: code for code, char in enumerate(alphabet)}
+        if secret is None:
+            self.target = np.random.default_rng(seed).integers(len(alphabet), size=length, dtype=np.uint8)
+        else:
+            self.target = self.encode(secret)
+        self.submissions = 0
+        self.queries = 0
+
+    @property
+    def secret(self):
+        return self.decode(self.target)
+
+    def encode(self, text):
+        if len(text) != self.length or any(char not in self.lookup for char in text):
+            raise ValueError(f"Guesses must be {self.length} characters from the alphabet")
+        return np.array([self.lookup[char] for char in text], dtype=np.uint8)
+
+    def decode(self, genome):
+        return ''.join(self.symbols[genome])
+
+    def score(self, population):
+        # one submission scores a whole batch of guesses at once
+        population = np.atleast_2d(population)
+        self.submissions += 1
+        self.queries += len(population)
+        return (population == self.target).sum(axis=1)
+
+
+class CachedOracle:
+    def __init__(self, oracle, capacity=1 << 16):
+        self.oracle = oracle
+        self.capacity = capacity
+        self.length = oracle.length
+        self.alphabet = oracle.alphabet
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def secret(self):
+        return self.oracle.secret
+
+    @property
+    def submissions(self):
+        return self.oracle.submissions
+
+    @property
+    def queries(self):
+        return self.oracle.queries
+
+    def encode(self, text):
+        return self.oracle.encode(text)
+
+    def decode(self, genome):
+        return self.oracle.decode(genome)
+
+    def score(self, population):
+        # identical genomes in one generation are sent once, and genomes seen before are not sent at all
+        population = np.ascontiguousarray(np.atleast_2d(population), dtype=np.uint8)
+        rows = population.view(np.dtype((np.void, population.shape[1]))).ravel()
+        unique, first, inverse = np.unique(rows, return_index=True, return_inverse=True)
+        keys = [row.tobytes() for row in unique]
+        scores = np.empty(len(keys), dtype=np.int64)
+        missing = []
+        for k, key in enumerate(keys):
+            score = self.cache.get(key)
+            if score is None:
+                missing.append(k)
+            else:
+                self.cache.move_to_end(key)
+                scores[k] = score
+        self.hits += len(population) - len(missing)
+        self.misses += len(missing)
+
+        if missing:
+            scores[missing] = self.oracle.score(population[first[missing]])
+            cache = self.cache
+            for k in missing:
+                cache[keys[k]] = int(scores[k])
+            while len(cache) > self.capacity:
+                cache.popitem(last=False)
+        return scores[inverse.ravel()]
@@ -0,0 +1,198 @@
+import argparse
+import numpy as np
+from password_oracle import PasswordOracle, ALPHABETS
+
+
+class PasswordSolver:
+    # Plans each batch of guesses from everything the earlier scores proved:
+    #  - a guess of one repeated symbol scores how often that symbol occurs in the secret
+    #  - with a symbol known to be wrong at every other position, a guess holding a symbol on a
+    #    subset of positions scores how many of them hide it, so its positions are found by
+    #    adaptive group testing: every group whose count is neither zero nor full is split again
+    def __init__(self, oracle, batch_size=7):
+        self.oracle = oracle
+        self.length = oracle.length
+        self.alphabet_size = len(oracle.alphabet)
+        self.batch_size = batch_size
+        self.counts = np.full(self.alphabet_size, -1)
+        self.candidates = [set(range(self.alphabet_size)) for _ in range(self.length)]
+        self.known = np.full(self.length, -1)
+        # symbol -> [positions, occurrences of the symbol among them], the positions partition its candidates
+        self.groups = {}
+        self.batches = 0
+        self.best = 0
+        self.best_genome = None
+
+    @property
+    def solved(self):
+        return self.best == self.length
+
+    def fillers(self):
+        # a symbol ruled out at each position, so untested positions add nothing to a score
+        fill = np.empty(self.length, dtype=np.uint8)
+        for position in range(self.length):
+            if self.known[position] >= 0:
+                fill[position] = (self.known[position] + 1) % self.alphabet_size
+            elif len(self.candidates[position]) < self.alphabet_size:
+                fill[position] = min(set(range(self.alphabet_size)) - self.candidates[position])
+            else:
+                return None
+        return fill
+
+    def plan(self):
+        if (self.known >= 0).all():
+            return [("answer", None, None, [self.known.astype(np.uint8)])]
+        tests = []
+        slots = self.batch_size
+
+        fill = self.fillers()
+        if fill is not None:
+            ambiguous = [(symbol, group) for symbol, groups in self.groups.items() for group in groups
+                         if 0 < group[1] < len(group[0])]
+            # every ambiguous group gets one split before any group gets a finer one
+            shares = [0] * len(ambiguous)
+            while slots and any(share < len(group[0]) - 1 for share, (_, group) in zip(shares, ambiguous)):
+                for i, (_, group) in enumerate(ambiguous):
+                    if slots and shares[i] < len(group[0]) - 1:
+                        shares[i] += 1
+                        slots -= 1
+            for (symbol, group), share in zip(ambiguous, shares):
+                if share:
+                    # the last part's count follows from the group's total, so it is never queried
+                    parts = np.array_split(np.array(sorted(group[0])), share + 1)
+                    genomes = []
+                    for part in parts[:-1]:
+                        genome = fill.copy()
+                        genome[part] = symbol
+                        genomes.append(genome)
+                    tests.append(("split", symbol, (group, parts), genomes))
+
+        uncounted = np.flatnonzero(self.counts < 0)
+        for symbol in uncounted[:slots]:
+            tests.append(("count", symbol, None, [np.full(self.length, symbol, dtype=np.uint8)]))
+        slots -= min(slots, len(uncounted))
+
+        if fill is None and not len(uncounted):
+            # every symbol occurs somewhere, so probe single positions against a repeated-symbol reference:
+            # the score moves by -1, 0 or +1 and each outcome either solves the position or rules out a symbol
+            reference = int(np.flatnonzero(self.counts > 0)[0])
+            probe = (reference + 1) % self.alphabet_size
+            unsure = [p for p in range(self.length) if len(self.candidates[p]) == self.alphabet_size]
+            for position in unsure[:slots]:
+                genome = np.full(self.length, reference, dtype=np.uint8)
+                genome[position] = probe
+                tests.append(("probe", reference, (position, probe), [genome]))
+            slots -= min(slots, len(unsure))
+
+        # spare slots carry guesses consistent with what is known, any of which may hit the secret
+        seen = {genome.tobytes() for test in tests for genome in test[3]}
+        for option in range(slots):
+            genome = self.known.astype(np.uint8)
+            for position in np.flatnonzero(self.known < 0):
+                choices = sorted(self.candidates[position])
+                genome[position] = choices[option % len(choices)]
+            if genome.tobytes() not in seen:
+                seen.add(genome.tobytes())
+                tests.append(("guess", None, None, [genome]))
+        return tests
+
+    def learn_count(self, symbol, count):
+        self.counts[symbol] = count
+        positions = {p for p in range(self.length) if self.known[p] < 0 and symbol in self.candidates[p]}
+        self.groups[symbol] = [[positions, count - int(np.sum(self.known == symbol))]]
+
+    def infer_counts(self):
+        uncounted = np.flatnonzero(self.counts < 0)
+        total = self.counts[self.counts >= 0].sum()
+        if len(uncounted) and total == self.length:
+            for symbol in uncounted:
+                self.learn_count(symbol, 0)
+        elif len(uncounted) == 1:
+            self.learn_count(uncounted[0], self.length - total)
+
+    def settle(self):
+        changed = True
+        while changed:
+            changed = False
+            for position in np.flatnonzero(self.known < 0):
+                if len(self.candidates[position]) == 1:
+                    self.known[position] = next(iter(self.candidates[position]))
+                    changed = True
+            for symbol, groups in self.groups.items():
+                for group in groups:
+                    positions = group[0]
+                    for position in list(positions):
+                        if self.known[position] >= 0 or symbol not in self.candidates[position]:
+                            positions.discard(position)
+                            group[1] -= self.known[position] == symbol
+                    if group[1] == 0:
+                        for position in positions:
+                            self.candidates[position].discard(symbol)
+                        changed |= bool(positions)
+                        positions.clear()
+                    elif group[1] == len(positions):
+                        for position in positions:
+                            self.candidates[position] = {symbol}
+                        changed = True
+                        positions.clear()
+                groups[:] = [group for group in groups if group[0]]
+
+    def step(self):
+        tests = self.plan()
+        genomes = np.array([genome for test in tests for genome in test[3]])
+        scores = self.oracle.score(genomes)
+        self.batches += 1
+        top = int(np.argmax(scores))
+        if self.best_genome is None or scores[top] > self.best:
+            self.best, self.best_genome = int(scores[top]), genomes[top].copy()
+
+        offset = 0
+        for kind, symbol, payload, batch in tests:
+            results = scores[offset:offset + len(batch)].tolist()
+            offset += len(batch)
+            if kind == "count":
+                self.learn_count(symbol, results[0])
+            elif kind == "split":
+                group, parts = payload
+                hits = results + [group[1] - sum(results)]
+                groups = self.groups[symbol]
+                groups[:] = [other for other in groups if other is not group] + \
+                    [[set(part.tolist()), count] for part, count in zip(parts, hits)]
+            elif kind == "probe":
+                position, probe = payload
+                delta = results[0] - self.counts[symbol]
+                if delta < 0:
+                    self.candidates[position] = {symbol}
+                elif delta > 0:
+                    self.candidates[position] = {probe}
+                else:
+                    self.candidates[position] -= {symbol, probe}
+        self.infer_counts()
+        self.settle()
+        return genomes, scores
+
+    def run(self, max_batches=10000):
+        while not self.solved and self.batches < max_batches:
+            self.step()
+        return self.solved
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve passwords by planning batches of guesses.")
+    parser.add_argument('--length', type=int, default=6)
+    parser.add_argument('--alphabet', choices=sorted(ALPHABETS), default="lowercase")
+    parser.add_argument('--batch-size', type=int, default=7, help="guesses per submission")
+    parser.add_argument('-n', '--seeds', type=int, default=20)
+    args = parser.parse_args()
+
+    submissions, queries = [], []
+    for seed in range(args.seeds):
+        secret_seed, _ = np.random.SeedSequence(seed).spawn(2)
+        oracle = PasswordOracle(args.length, ALPHABETS[args.alphabet], seed=secret_seed)
+        solver = PasswordSolver(oracle, args.batch_size)
+        if not solver.run():
+            raise RuntimeError(f"Seed {seed} was not solved")
+        submissions.append(oracle.submissions)
+        queries.append(oracle.queries)
+    print(f"{args.seeds} secrets solved, submissions p50 {np.median(submissions):.0f} max {max(submissions)}, "
+          f"genomes scored p50 {np.median(queries):.0f}")
@@ -0,0 +1,53 @@
+import numpy as np
+
+# every strategy returns two index arrays: the first and second parent of each child
+
+
+def top_two(fitness, count, rng):
+    # the original behaviour: every child is bred from the two fittest individuals
+    top = np.argpartition(-fitness, 1)[:2]
+    first, second = top[np.argsort(-fitness[top], kind='stable')]
+    return np.full(count, first), np.full(count, second)
+
+
+def tournament(fitness, count, rng, size=3):
+    entrants = rng.integers(len(fitness), size=(2, count, size))
+    winners = np.argmax(fitness[entrants], axis=2)
+    return np.take_along_axis(entrants, winners[..., None], axis=2)[..., 0]
+
+
+def alias_table(weights):
+    # Vose's method: O(n) to build, then every draw is one uniform index and one biased coin
+    n = len(weights)
+    prob = weights * (n / weights.sum())
+    alias = np.arange(n)
+    small = [i for i in range(n) if prob[i] < 1]
+    large = [i for i in range(n) if prob[i] >= 1]
+    while small and large:
+        less, more = small.pop(), large.pop()
+        alias[less] = more
+        prob[more] -= 1 - prob[less]
+        (small if prob[more] < 1 else large).append(more)
+    prob[small + large] = 1
+    return prob, alias
+
+
+def roulette(fitness, count, rng):
+    weights = np.clip(fitness, 0, None).astype(np.float64)
+    if not weights.any():
+        weights[:] = 1
+    prob, alias = alias_table(weights)
+    picks = rng.integers(len(fitness), size=(2, count))
+    return np.where(rng.random((2, count)) < prob[picks], picks, alias[picks])
+
+
+def rank(fitness, count, rng):
+    # linear ranking: the k-th weakest has weight k + 1, so the inverse CDF has a closed form
+    order = np.argsort(fitness, kind='stable')
+    n = len(fitness)
+    u = rng.random((2, count)) * (n * (n + 1) / 2)
+    k = np.floor((np.sqrt(1 + 8 * u) - 1) / 2).astype(np.int64)
+    return order[np.minimum(k, n - 1)]
+
+
+SELECTIONS = {"top-two": top_two, "tournament": tournament, "roulette": roulette, "rank": rank}
@@ -0,0 +1,126 @@
+import argparse
+import tkinter as tk
+import numpy as np
+from local_search import HillClimber, SimulatedAnnealing, SCHEDULES, PasswordOracle, CachedOracle, ALPHABETS
+
+METHODS = ("Simulated Annealing", "Hill Climbing")
+PLOT_WIDTH, PLOT_HEIGHT = 560, 200
+
+
+class AnnealingGame:
+    def __init__(self, root, length=6, alphabet=ALPHABETS["lowercase"], steps_per_frame=25):
+        self.root = root
+        self.length = length
+        self.alphabet = alphabet
+        self.steps_per_frame = steps_per_frame
+        self.root.title("Password Annealing")
+        self.root.geometry(f"{max(620, 10 * length + 200)}x520")
+        self.root.configure(bg="#2c3e50")
+        self.custom_font = ("Arial", 12)
+
+        self.oracle = CachedOracle(PasswordOracle(length, alphabet))
+        print(self.oracle.secret)  # Debugging
+        self.search = None
+        self.running = False
+
+        controls = tk.Frame(root, bg="#2c3e50")
+        controls.pack(pady=10)
+        self.method_var = tk.StringVar(value=METHODS[0])
+        tk.OptionMenu(controls, self.method_var, *METHODS).pack(side=tk.LEFT, padx=5)
+        self.schedule_var = tk.StringVar(value="exponential")
+        tk.OptionMenu(controls, self.schedule_var, *SCHEDULES).pack(side=tk.LEFT, padx=5)
+        self.t0_slider = tk.Scale(controls, from_=0.05, to=3, resolution=0.05, orient=tk.HORIZONTAL,
+                                  label="Start Temperature", font=self.custom_font, length=180, bg="#34495e",
+                                  fg="white", troughcolor="#2ecc71", sliderlength=20)
+        self.t0_slider.set(0.5)
+        self.t0_slider.pack(side=tk.LEFT, padx=5)
+
+        buttons = tk.Frame(root, bg="#2c3e50")
+        buttons.pack(pady=5)
+        self.start_button = tk.Button(buttons, text="Start", font=("Arial", 12, "bold"), bg="#2ecc71", fg="white",
+                                      bd=0, activebackground="#27ae60", command=self.toggle)
+        self.start_button.pack(side=tk.LEFT, padx=10)
+        tk.Button(buttons, text="Reset", font=("Arial", 12, "bold"), bg="#e74c3c", fg="white", bd=0,
+                  command=self.reset).pack(side=tk.LEFT, padx=10)
+
+        self.guess_label = tk.Label(root, text="", font=("Courier", 14, "bold"), bg="#2c3e50", fg="white")
+        self.guess_label.pack(pady=10)
+        self.stats_label = tk.Label(root, text="", font=self.custom_font, bg="#2c3e50", fg="white")
+        self.stats_label.pack(pady=5)
+
+        self.plot = tk.Canvas(root, width=PLOT_WIDTH, height=PLOT_HEIGHT, bg="#34495e", highlightthickness=0)
+        self.plot.pack(pady=10)
+        tk.Label(root, text="green: current score   orange: temperature", font=self.custom_font, bg="#2c3e50",
+                 fg="white").pack()
+
+        self.excellent_label = tk.Label(root, text="", font=("Arial", 16, "bold"), bg="#2c3e50", fg="#2ecc71")
+        self.excellent_label.pack(pady=5)
+
+    def build_search(self):
+        if self.method_var.get() == "Hill Climbing":
+            return HillClimber(self.oracle, patience=20 * self.length)
+        return SimulatedAnnealing(self.oracle, schedule=self.schedule_var.get(), t0=self.t0_slider.get(),
+                                  horizon=2000 * self.length)
+
+    def toggle(self):
+        self.running = not self.running
+        self.start_button.config(text="Stop" if self.running else "Start")
+        if self.running:
+            if self.search is None:
+                self.search = self.build_search()
+            self.root.after(16, self.animate)
+
+    def animate(self):
+        if not self.running:
+            return
+        search = self.search
+        for _ in range(self.steps_per_frame):
+            search.step()
+            if search.solved:
+                break
+        self.show()
+        if search.solved:
+            self.running = False
+            self.start_button.config(text="Start", state=tk.DISABLED)
+            self.excellent_label.config(text="Excellent!")
+        else:
+            self.root.after(16, self.animate)
+
+    def show(self):
+        search = self.search
+        temperature = getattr(search, "temperatures", None)
+        self.guess_label.config(text=self.oracle.decode(search.current))
+        self.stats_label.config(text=f"Score: {search.score}/{self.length}   Best: {search.best}   "
+                                     f"Steps: {search.steps}   Submissions: {self.oracle.submissions}"
+                                     + (f"   T: {temperature[-1]:.3f}" if temperature else ""))
+        self.plot.delete("trace")
+        self.draw_trace(np.array(search.history) / self.length, "#2ecc71")
+        if temperature:
+            self.draw_trace(np.array(temperature) / max(self.t0_slider.get(), 1e-9), "#e67e22")
+
+    def draw_trace(self, values, color):
+        # long runs are sampled down to one point per pixel column
+        if len(values) < 2:
+            return
+        columns = np.linspace(0, len(values) - 1, min(len(values), PLOT_WIDTH)).astype(int)
+        xs = np.linspace(0, PLOT_WIDTH, len(columns))
+        ys = PLOT_HEIGHT - 5 - np.clip(values[columns], 0, 1) * (PLOT_HEIGHT - 10)
+        self.plot.create_line(*np.column_stack([xs, ys]).ravel().tolist(), fill=color, width=2, tags="trace")
+
+    def reset(self):
+        self.running = False
+        self.root.destroy()
+        root = tk.Tk()
+        AnnealingGame(root, self.length, self.alphabet, self.steps_per_frame)
+        root.mainloop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Watch hill climbing or simulated annealing guess a password.")
+    parser.add_argument('--length', type=int, default=6)
+    parser.add_argument('--alphabet', choices=sorted(ALPHABETS), default="lowercase")
+    args = parser.parse_args()
+
+    root = tk.Tk()
+    game = AnnealingGame(root, args.length, ALPHABETS[args.alphabet])
+    root.mainloop()
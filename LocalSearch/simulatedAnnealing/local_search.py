@@ -0,0 +1,189 @@
+import os
+import sys
+import csv
+import time
+import argparse
+import numpy as np
+from collections import defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'geneticAlgorithm'))
+from password_oracle import PasswordOracle, CachedOracle, ALPHABETS  # noqa: E402
+from genetic_engine import GeneticEngine  # noqa: E402
+from password_solver import PasswordSolver  # noqa: E402
+
+
+def exponential(t0, step, horizon):
+    # falls to 1% of the starting temperature by the end of the horizon
+    return t0 * 0.01 ** (step / horizon)
+
+
+def linear(t0, step, horizon):
+    return t0 * max(1 - step / horizon, 0.0)
+
+
+def logarithmic(t0, step, horizon):
+    return t0 / np.log(step + np.e)
+
+
+SCHEDULES = {"exponential": exponential, "linear": linear, "logarithmic": logarithmic}
+
+
+class LocalSearch:
+    def __init__(self, oracle, seed=None):
+        self.oracle = oracle
+        self.length = oracle.length
+        self.alphabet_size = len(oracle.alphabet)
+        self.rng = np.random.default_rng(seed)
+        self.steps = 0
+        self.best = 0
+        self.best_genome = None
+        self.history = []
+        self.current, self.score = None, None
+
+    def random_genome(self):
+        return self.rng.integers(self.alphabet_size, size=self.length, dtype=np.uint8)
+
+    def evaluate(self, genome):
+        score = int(self.oracle.score(genome)[0])
+        if self.best_genome is None or score > self.best:
+            self.best, self.best_genome = score, genome.copy()
+        return score
+
+    def start(self):
+        self.current = self.random_genome()
+        self.score = self.evaluate(self.current)
+
+    def neighbor(self):
+        genome = self.current.copy()
+        point = self.rng.integers(self.length)
+        # always a different symbol, so no step is spent re-scoring the current guess
+        genome[point] = (int(genome[point]) + self.rng.integers(1, self.alphabet_size)) % self.alphabet_size
+        return genome
+
+    @property
+    def solved(self):
+        return self.best == self.length
+
+    def step(self):
+        if self.current is None:
+            self.start()
+        candidate = self.neighbor()
+        score = self.evaluate(candidate)
+        if self.accept(score - self.score):
+            self.current, self.score = candidate, score
+        self.steps += 1
+        self.history.append(self.score)
+
+    def run(self, max_steps=100000):
+        while not self.solved and self.steps < max_steps:
+            self.step()
+        return self.solved
+
+
+class HillClimber(LocalSearch):
+    def __init__(self, oracle, seed=None, patience=0):
+        super().__init__(oracle, seed)
+        self.patience = patience
+        self.stale = 0
+        self.restarts = 0
+
+    def accept(self, delta):
+        # sideways moves are taken so plateaus are walked instead of waited on
+        self.stale = 0 if delta > 0 else self.stale + 1
+        return delta >= 0
+
+    def step(self):
+        super().step()
+        if self.patience and self.stale >= self.patience and not self.solved:
+            self.start()
+            self.stale = 0
+            self.restarts += 1
+
+
+class SimulatedAnnealing(LocalSearch):
+    def __init__(self, oracle, seed=None, schedule="exponential", t0=0.5, horizon=20000):
+        if schedule not in SCHEDULES:
+            raise ValueError(f"Schedule must be one of {', '.join(SCHEDULES)}")
+        super().__init__(oracle, seed)
+        self.schedule = schedule
+        self.t0 = t0
+        self.horizon = horizon
+        self.temperatures = []
+
+    @property
+    def temperature(self):
+        return SCHEDULES[self.schedule](self.t0, self.steps, self.horizon)
+
+    def accept(self, delta):
+        temperature = self.temperature
+        self.temperatures.append(temperature)
+        if delta >= 0:
+            return True
+        return temperature > 0 and self.rng.random() < np.exp(delta / temperature)
+
+
+METHODS = ["solver", "hill-climbing", "annealing", "genetic"]
+FIELDS = ['method', 'seed', 'solved', 'steps', 'submissions', 'queries', 'time_ms']
+
+
+def run_method(method, seed, length, alphabet, max_steps, schedule="exponential", t0=0.5):
+    # seed k hides the same secret for every method, as in ga_experiments.py
+    secret_seed, search_seed = np.random.SeedSequence(seed).spawn(2)
+    oracle = CachedOracle(PasswordOracle(length, alphabet, seed=secret_seed))
+    start = time.perf_counter()
+    if method == "solver":
+        # the planned-batch baseline is deterministic, so it needs no search seed
+        search = PasswordSolver(oracle)
+        solved, steps = search.run(max_steps), search.batches
+    elif method == "genetic":
+        search = GeneticEngine(oracle, seed=search_seed, adaptive=True)
+        solved, steps = search.run(max_steps), search.generation
+    else:
+        if method == "hill-climbing":
+            search = HillClimber(oracle, search_seed)
+        else:
+            search = SimulatedAnnealing(oracle, search_seed, schedule, t0, max_steps)
+        solved, steps = search.run(max_steps), search.steps
+    return {'method': method if method != "annealing" else f"annealing-{schedule}", 'seed': seed, 'solved': solved,
+            'steps': steps, 'submissions': oracle.submissions, 'queries': oracle.queries,
+            'time_ms': (time.perf_counter() - start) * 1000}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare local search methods on identical secrets")
+    parser.add_argument('-m', '--methods', nargs='+', default=METHODS, choices=METHODS)
+    parser.add_argument('--schedules', nargs='+', default=list(SCHEDULES), choices=list(SCHEDULES))
+    parser.add_argument('--t0', type=float, default=0.5, help="starting temperature")
+    parser.add_argument('-n', '--seeds', type=int, default=20)
+    parser.add_argument('--length', type=int, default=6)
+    parser.add_argument('--alphabet', choices=sorted(ALPHABETS), default="lowercase")
+    parser.add_argument('--steps', type=int, default=20000, help="step (or generation) budget, also the cooling horizon")
+    parser.add_argument('--csv', help="write per-run results to this CSV file")
+    args = parser.parse_args()
+
+    rows = []
+    for method in args.methods:
+        for schedule in (args.schedules if method == "annealing" else [None]):
+            for seed in range(args.seeds):
+                rows.append(run_method(method, seed, args.length, ALPHABETS[args.alphabet], args.steps, schedule,
+                                       args.t0))
+
+    groups = defaultdict(list)
+    for row in rows:
+        groups[row['method']].append(row)
+    print(f"{'method':<25}{'runs':>6}{'solved':>8}{'queries p50':>13}{'submissions p50':>17}{'time ms':>10}")
+    for method, group in groups.items():
+        print(f"{method:<25}{len(group):>6}{sum(row['solved'] for row in group):>8}"
+              f"{np.median([row['queries'] for row in group]):>13.0f}"
+              f"{np.median([row['submissions'] for row in group]):>17.0f}"
+              f"{np.mean([row['time_ms'] for row in group]):>10.1f}")
+
+    if args.csv:
+        with open(args.csv, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+import os
+import csv
+import glob
+import json
+import time
+import argparse
+import tracemalloc
+import numpy as np
+from statistics import mean
+from collections import namedtuple, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from GridGraph import GridGraph
+from PathFinder import PathFinder
+from Landmarks import LandmarkHeuristic
+from Hierarchical import HierarchicalPathFinder
+from FlowField import DistanceField, UNREACHABLE
+
+MAPS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'maps')
+PASSABLE = '.GS'
+
+Scenario = namedtuple('Scenario', ['bucket', 'map_path', 'start', 'goal', 'optimal'])
+# HPA*'s cluster entrances are 4-connected, so it cannot be compared against 8-connected optima
+FOUR_CONNECTED_ONLY = {"HPA*"}
+FIELDS = ['map', 'algorithm', 'bucket', 'expanded', 'cost', 'optimal', 'octile_optimal', 'ratio', 'time_ms', 'peak_kb']
+
+
+def load_map(path):
+    header = {}
+    with open(path) as f:
+        line = f.readline().strip()
+        while line != 'map':
+            if not line:
+                raise ValueError(f"{path}: missing 'map' section")
+            key, _, value = line.partition(' ')
+            header[key] = value
+            line = f.readline().strip()
+        n, m = int(header['height']), int(header['width'])
+        rows = [f.readline().rstrip('\n').ljust(m, '@')[:m] for _ in range(n)]
+    chars = np.frombuffer(''.join(rows).encode('ascii'), dtype=np.uint8).reshape(n, m)
+    return ~np.isin(chars, np.frombuffer(PASSABLE.encode('ascii'), dtype=np.uint8))
+
+
+def load_scenarios(path):
+    scenarios = []
+    base = os.path.dirname(os.path.abspath(path))
+    with open(path) as f:
+        for line in f:
+            parts = line.rstrip('\n').split('\t')
+            if len(parts) < 9:
+                continue
+            bucket, map_name, _, _, sx, sy, gx, gy, optimal = parts[:9]
+            scenarios.append(Scenario(int(bucket), os.path.join(base, os.path.basename(map_name)),
+                                      (int(sy), int(sx)), (int(gy), int(gx)), float(optimal)))
+    return scenarios
+
+
+_graphs = {}
+
+
+def load_graph(map_path, diagonal=False):
+    key = (map_path, diagonal)
+    if key not in _graphs:
+        # MovingAI optimal costs are octile with no corner cutting
+        _graphs[key] = GridGraph(load_map(map_path), diagonal=diagonal)
+    return _graphs[key]
+
+
+def path_length(graph, path):
+    # MovingAI lengths are octile: a diagonal step is sqrt 2, not the 1.4 of the 10/14 integer search costs
+    cells = np.array(path)
+    diagonal = (np.diff(cells, axis=0) != 0).all(axis=1)
+    entered = graph.costs[cells[1:, 0], cells[1:, 1]]
+    return float((entered * np.where(diagonal, np.sqrt(2), 1.0)).sum())
+
+
+def reference_optimum(graph, scenario, diagonal):
+    if diagonal:
+        return scenario.optimal
+    # the .scen optima are octile lengths, so 4-connected runs are held to their own exact optimum instead;
+    # a fresh field keeps the Flow Field timings from finding this goal already cached
+    distance = int(DistanceField(graph, graph.to_node(scenario.goal)).dist[graph.to_node(scenario.start)])
+    return float(distance) if distance != UNREACHABLE else None
+
+
+def run_bucket(algorithm, scenarios, measure_memory=True, diagonal=False):
+    rows = []
+    for scenario in scenarios:
+        graph = load_graph(scenario.map_path, diagonal)
+        optimal = reference_optimum(graph, scenario, diagonal)
+        # landmark tables and the HPA* abstraction are per-map preprocessing, so keep them out of the query timings
+        if algorithm == "ALT":
+            LandmarkHeuristic.for_graph(graph)
+        elif algorithm == "HPA*":
+            HierarchicalPathFinder.for_graph(graph)
+        started = time.perf_counter()
+        path, expanded = PathFinder(graph, scenario.start, scenario.goal).run(algorithm)
+        elapsed = time.perf_counter() - started
+
+        peak = None
+        if measure_memory:
+            tracemalloc.start()
+            PathFinder(graph, scenario.start, scenario.goal).run(algorithm)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+        cost = path_length(graph, path) if path else None
+        rows.append({
+            'map': os.path.basename(scenario.map_path),
+            'algorithm': algorithm,
+            'bucket': scenario.bucket,
+            'expanded': expanded,
+            'cost': cost,
+            'optimal': optimal,
+            'octile_optimal': scenario.optimal,
+            'ratio': cost / optimal if cost is not None and optimal else None,
+            'time_ms': elapsed * 1000,
+            'peak_kb': peak / 1024 if peak is not None else None,
+        })
+    return rows
+
+
+def run_benchmark(scen_paths, algorithms, workers=None, measure_memory=True, diagonal=False):
+    buckets = defaultdict(list)
+    for scen_path in scen_paths:
+        for scenario in load_scenarios(scen_path):
+            buckets[(scenario.map_path, scenario.bucket)].append(scenario)
+
+    rows = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_bucket, algorithm, scenarios, measure_memory, diagonal)
+                   for (_, _), scenarios in sorted(buckets.items())
+                   for algorithm in algorithms]
+        for future in futures:
+            rows.extend(future.result())
+    return rows
+
+
+def summarize(rows):
+    groups = defaultdict(list)
+    for row in rows:
+        groups[(row['map'], row['algorithm'], row['bucket'])].append(row)
+
+    summary = []
+    for (map_name, algorithm, bucket), group in sorted(groups.items()):
+        solved = [row for row in group if row['cost'] is not None]
+        peaks = [row['peak_kb'] for row in group if row['peak_kb'] is not None]
+        summary.append({
+            'map': map_name,
+            'algorithm': algorithm,
+            'bucket': bucket,
+            'scenarios': len(group),
+            'solved': len(solved),
+            'expanded': mean(row['expanded'] for row in group),
+            'ratio': mean(row['ratio'] for row in solved) if solved else None,
+            'time_ms': mean(row['time_ms'] for row in group),
+            'peak_kb': max(peaks) if peaks else None,
+        })
+    return summary
+
+
+def print_summary(summary):
+    def fmt(value, spec):
+        return format(value, spec) if value is not None else '-'
+
+    print(f"{'map':<20}{'algorithm':<12}{'bucket':>7}{'runs':>6}{'solved':>8}"
+          f"{'expanded':>11}{'cost/opt':>10}{'time ms':>10}{'peak KB':>10}")
+    for row in summary:
+        print(f"{row['map']:<20}{row['algorithm']:<12}{row['bucket']:>7}{row['scenarios']:>6}{row['solved']:>8}"
+              f"{fmt(row['expanded'], '.1f'):>11}{fmt(row['ratio'], '.3f'):>10}"
+              f"{fmt(row['time_ms'], '.2f'):>10}{fmt(row['peak_kb'], '.1f'):>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run PathFinder on MovingAI .map/.scen benchmarks")
+    parser.add_argument('scenarios', nargs='*', help=".scen files (defaults to the bundled sample maps)")
+    parser.add_argument('-a', '--algorithms', nargs='+', choices=list(PathFinder.ALGORITHMS),
+                        help="defaults to every algorithm that supports the chosen connectivity")
+    parser.add_argument('-w', '--workers', type=int, default=None)
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc pass")
+    parser.add_argument('--diagonal', action='store_true', help="search 8-connected grids (octile costs)")
+    parser.add_argument('--csv', help="write per-scenario results to this CSV file")
+    parser.add_argument('--json', help="write the per-bucket summary to this JSON file")
+    args = parser.parse_args()
+    if args.algorithms is None:
+        args.algorithms = [name for name in PathFinder.ALGORITHMS
+                           if not (args.diagonal and name in FOUR_CONNECTED_ONLY)]
+    elif args.diagonal and FOUR_CONNECTED_ONLY.intersection(args.algorithms):
+        parser.error(f"{', '.join(sorted(FOUR_CONNECTED_ONLY))} only searches 4-connected grids")
+
+    scen_paths = args.scenarios or sorted(glob.glob(os.path.join(MAPS_DIR, '*.scen')))
+    rows = run_benchmark(scen_paths, args.algorithms, args.workers, not args.no_memory, args.diagonal)
+    summary = summarize(rows)
+    print_summary(summary)
+
+    if args.csv:
+        with open(args.csv, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
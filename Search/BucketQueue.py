@@ -0,0 +1,24 @@
+class BucketQueue:
+    def __init__(self, span):
+        self.span = span + 1
+        self.buckets = [[] for _ in range(self.span)]
+        self.current = 0
+        self.count = 0
+
+    def push(self, key, item):
+        # keys stay within [current, current + span], so each slot holds one key
+        self.buckets[key % self.span].append(item)
+        self.count += 1
+
+    def pop(self):
+        if not self.count:
+            raise IndexError("pop from an empty bucket queue")
+        bucket = self.buckets[self.current % self.span]
+        while not bucket:
+            self.current += 1
+            bucket = self.buckets[self.current % self.span]
+        self.count -= 1
+        return self.current, bucket.pop()
+
+    def __len__(self):
+        return self.count
@@ -0,0 +1,139 @@
+import numpy as np
+from collections import deque
+
+
+class ComponentLabels:
+    def __init__(self, blocked):
+        blocked = np.asarray(blocked, dtype=bool)
+        self.n, self.m = blocked.shape
+        self.labels = self._label(blocked)
+        roots, counts = np.unique(self.labels[self.labels >= 0], return_counts=True)
+        self.sizes = dict(zip(roots.tolist(), counts.tolist()))
+        self.next_label = self.n * self.m
+
+    def _label(self, blocked):
+        ids = np.arange(self.n * self.m, dtype=np.int32).reshape(self.n, self.m)
+        free = ~blocked
+        across = free[:, :-1] & free[:, 1:]
+        down = free[:-1, :] & free[1:, :]
+        u = np.concatenate((ids[:, :-1][across], ids[:-1, :][down]))
+        v = np.concatenate((ids[:, 1:][across], ids[1:, :][down]))
+
+        labels = np.where(free.ravel(), ids.ravel(), -1).astype(np.int32)
+        while True:
+            lu, lv = labels[u], labels[v]
+            split = lu != lv
+            if not split.any():
+                return labels
+            # hook every root onto its smallest neighbouring root, then compress with pointer jumping
+            np.minimum.at(labels, np.maximum(lu, lv)[split], np.minimum(lu, lv)[split])
+            nodes = np.flatnonzero(labels >= 0)
+            while True:
+                jumped = labels[labels[nodes]]
+                if np.array_equal(jumped, labels[nodes]):
+                    break
+                labels[nodes] = jumped
+
+    def neighbors(self, node):
+        i, j = divmod(node, self.m)
+        result = []
+        if i > 0:
+            result.append(node - self.m)
+        if i < self.n - 1:
+            result.append(node + self.m)
+        if j > 0:
+            result.append(node - 1)
+        if j < self.m - 1:
+            result.append(node + 1)
+        return result
+
+    def connected(self, a, b):
+        return self.labels[a] >= 0 and self.labels[a] == self.labels[b]
+
+    def is_blocked(self, node):
+        return self.labels[node] < 0
+
+    def set_free(self, node):
+        if self.labels[node] >= 0:
+            return
+        around = {int(self.labels[v]): v for v in self.neighbors(node) if self.labels[v] >= 0}
+        if not around:
+            self.labels[node] = self.next_label
+            self.sizes[self.next_label] = 1
+            self.next_label += 1
+            return
+        # union by size: relabel every smaller region into the largest one it now touches
+        keep = max(around, key=self.sizes.get)
+        for label, start in around.items():
+            if label != keep:
+                self._relabel(start, label, keep)
+                self.sizes[keep] += self.sizes.pop(label)
+        self.labels[node] = keep
+        self.sizes[keep] += 1
+
+    def set_blocked(self, node):
+        old = int(self.labels[node])
+        if old < 0:
+            return
+        self.labels[node] = -1
+        self.sizes[old] -= 1
+        starts = [v for v in self.neighbors(node) if self.labels[v] == old]
+        if len(starts) < 2:
+            if not self.sizes[old]:
+                del self.sizes[old]
+            return
+
+        # flood from every neighbour in lockstep; only the regions that run dry got cut off,
+        # so the work is proportional to the smaller pieces, not the whole component
+        owner = {start: k for k, start in enumerate(starts)}
+        group = list(range(len(starts)))
+        queues = [deque([start]) for start in starts]
+        members = [[start] for start in starts]
+        active = set(range(len(starts)))
+
+        def find(k):
+            while group[k] != k:
+                k = group[k]
+            return k
+
+        while len(active) > 1:
+            for k in list(active):
+                if k not in active:
+                    continue
+                if not queues[k]:
+                    active.discard(k)
+                    label = self.next_label
+                    self.next_label += 1
+                    self.labels[members[k]] = label
+                    self.sizes[label] = len(members[k])
+                    self.sizes[old] -= len(members[k])
+                    if len(active) == 1:
+                        break
+                    continue
+                u = queues[k].popleft()
+                for v in self.neighbors(u):
+                    if self.labels[v] != old:
+                        continue
+                    other = owner.get(v)
+                    if other is None:
+                        owner[v] = k
+                        members[k].append(v)
+                        queues[k].append(v)
+                    elif find(other) != k:
+                        merged = find(other)
+                        group[merged] = k
+                        queues[k].extend(queues[merged])
+                        members[k].extend(members[merged])
+                        active.discard(merged)
+        if not self.sizes[old]:
+            del self.sizes[old]
+
+    def _relabel(self, start, old, new):
+        self.labels[start] = new
+        queue = deque([start])
+        while queue:
+            u = queue.popleft()
+            for v in self.neighbors(u):
+                if self.labels[v] == old:
+                    self.labels[v] = new
+                    queue.append(v)
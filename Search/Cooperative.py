@@ -0,0 +1,192 @@
+import heapq
+import time
+from GridGraph import GridGraph
+from Components import ComponentLabels
+from Landmarks import LandmarkHeuristic
+
+
+class CooperativePlanner:
+    def __init__(self, graph, window=None, horizon=None, time_budget=None):
+        self.graph = graph
+        # agents make one 4-connected move per tick whatever the terrain, so plan on unit costs
+        self.unit = graph if graph.max_weight == 1 else GridGraph(graph.blocked)
+        self.landmarks = LandmarkHeuristic.for_graph(self.unit)
+        self.components = ComponentLabels(graph.blocked)
+        self.window = window
+        self.horizon = horizon
+        self.time_budget = time_budget
+        unit = self.unit
+        self.neighbors = [unit.indices[unit.indptr[node]:unit.indptr[node + 1]].tolist()
+                          for node in range(unit.size)]
+        self.expanded = 0
+        self.failed = []
+        self.clear()
+
+    def clear(self):
+        # space-time cells and moves are hashed to single ints: t * size + node and (t * size + u) * size + v
+        self.vertices = {}
+        self.edges = set()
+        self.latest = {}
+        self.parked = {}
+
+    def reserve(self, path, start_time, agent, park=True):
+        size = self.graph.size
+        for k, node in enumerate(path):
+            t = start_time + k
+            self.vertices[t * size + node] = agent
+            if self.latest.get(node, -1) < t:
+                self.latest[node] = t
+            if k:
+                self.edges.add(((t - 1) * size + path[k - 1]) * size + node)
+        if park:
+            self.parked[path[-1]] = start_time + len(path) - 1
+
+    def is_free(self, node, t, agent):
+        owner = self.vertices.get(t * self.graph.size + node, agent)
+        if owner != agent:
+            return False
+        parked = self.parked.get(node)
+        return parked is None or t < parked
+
+    def heuristic(self, goal):
+        gi, gj = divmod(goal, self.graph.m)
+        m = self.graph.m
+        estimate = self.landmarks.heuristic(goal)
+
+        def h(node):
+            i, j = divmod(node, m)
+            return max(abs(i - gi) + abs(j - gj), estimate(node))
+        return h
+
+    def search(self, agent, start, goal, start_time=0, window=None, avoid=()):
+        # without this check an unreachable goal makes A* sweep the whole space-time volume
+        if not self.components.connected(start, goal):
+            return None
+        size = self.graph.size
+        h = self.heuristic(goal)
+        limit = start_time + (window if window else self.horizon or 2 * h(start) + self.graph.n + self.graph.m)
+        neighbors, edges = self.neighbors, self.edges
+        root = start_time * size + start
+        parent = {root: None}
+        pq = [(start_time + h(start), -start_time, start)]
+        closed = set()
+        while pq:
+            _, t, node = heapq.heappop(pq)
+            t = -t
+            state = t * size + node
+            if state in closed:
+                continue
+            closed.add(state)
+            self.expanded += 1
+            # a window only has to be planned safely up to its end; past that the heuristic takes over
+            if (node == goal and self.latest.get(goal, -1) < t) or (window and t >= limit):
+                path = []
+                while state is not None:
+                    path.append(state % size)
+                    state = parent[state]
+                return path[::-1]
+            if t >= limit:
+                continue
+            nt = t + 1
+            for nxt in neighbors[node] + [node]:
+                key = nt * size + nxt
+                if key in parent or nxt in avoid or not self.is_free(nxt, nt, agent):
+                    continue
+                if nxt != node and (t * size + nxt) * size + node in edges:
+                    continue
+                parent[key] = state
+                heapq.heappush(pq, (nt + h(nxt), -nt, nxt))
+        return None
+
+    def plan(self, agents):
+        graph = self.graph
+        pairs = [(graph.to_node(start), graph.to_node(goal)) for start, goal in agents]
+        self.expanded = 0
+        self.failed = []
+        if self.window:
+            paths = self._plan_windowed(pairs)
+        else:
+            paths = self._plan_full(pairs)
+        return [None if path is None else [graph.to_cell(node) for node in path] for path in paths]
+
+    def _plan_full(self, pairs):
+        self.clear()
+        deadline = time.perf_counter() + self.time_budget if self.time_budget else None
+        # every agent holds its start at t=0, so earlier agents never plan through a later one's spawn
+        for agent, (start, _) in enumerate(pairs):
+            self.reserve([start], 0, agent, park=False)
+        # goals of agents still to be planned are kept clear, otherwise those agents end up waiting
+        # for everyone who walks over their goal late in the plan
+        pending = {}
+        for _, goal in pairs:
+            pending[goal] = pending.get(goal, 0) + 1
+        paths = []
+        for agent, (start, goal) in enumerate(pairs):
+            pending[goal] -= 1
+            if not pending[goal]:
+                del pending[goal]
+            path = None
+            if deadline is None or time.perf_counter() < deadline:
+                path = self.search(agent, start, goal, avoid=pending.keys() - {goal}) or self.search(agent, start, goal)
+            if path is None:
+                self.failed.append(agent)
+            else:
+                self.reserve(path, 0, agent)
+            paths.append(path)
+        return paths
+
+    def _plan_windowed(self, pairs):
+        window = self.window
+        advance = max(1, window // 2)
+        positions = [start for start, _ in pairs]
+        paths = [[start] for start, _ in pairs]
+        limit = self.horizon or 4 * (self.graph.n + self.graph.m)
+        deadline = time.perf_counter() + self.time_budget if self.time_budget else None
+        t0 = 0
+        order = list(range(len(pairs)))
+        while t0 < limit and any(positions[a] != pairs[a][1] for a in order):
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            self.clear()
+            for agent in order:
+                self.reserve([positions[agent]], t0, agent, park=False)
+            planned = {}
+            for agent in order:
+                start, goal = positions[agent], pairs[agent][1]
+                path = self.search(agent, start, goal, t0, window) or [start]
+                # finished agents keep their goal reserved for the rest of the window
+                path = path + [path[-1]] * (window + 1 - len(path))
+                self.reserve(path, t0, agent, park=False)
+                planned[agent] = path
+            for agent in order:
+                steps = planned[agent][1:advance + 1]
+                paths[agent].extend(steps)
+                positions[agent] = steps[-1]
+            t0 += advance
+            # rotate priorities so no agent is always the one that has to give way
+            order = order[1:] + order[:1]
+
+        self.failed = [a for a in range(len(pairs)) if positions[a] != pairs[a][1]]
+        for agent, (_, goal) in enumerate(pairs):
+            path = paths[agent]
+            while len(path) > 1 and path[-1] == path[-2] == goal:
+                path.pop()
+        return paths
+
+    @staticmethod
+    def conflicts(paths):
+        found = []
+        live = [(k, path) for k, path in enumerate(paths) if path]
+        makespan = max((len(path) for _, path in live), default=0)
+        for t in range(makespan):
+            at, moves = {}, {}
+            for k, path in live:
+                cell = path[min(t, len(path) - 1)]
+                if cell in at:
+                    found.append(('vertex', t, at[cell], k))
+                at[cell] = k
+                if 0 < t < len(path) and path[t - 1] != cell:
+                    if (cell, path[t - 1]) in moves:
+                        found.append(('edge', t, moves[(cell, path[t - 1])], k))
+                    moves[(path[t - 1], cell)] = k
+        return found
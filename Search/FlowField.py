@@ -0,0 +1,92 @@
+import numpy as np
+from collections import OrderedDict
+
+UNREACHABLE = np.iinfo(np.int32).max
+
+
+class DistanceField:
+    CACHE_SIZE = 16
+    _cache = OrderedDict()
+
+    def __init__(self, graph, goal):
+        self.graph = graph
+        self.goal = goal
+        self.dist = self._compute()
+
+    @classmethod
+    def for_goal(cls, graph, goal):
+        key = (graph.key, goal)
+        if key in cls._cache:
+            cls._cache.move_to_end(key)
+        else:
+            cls._cache[key] = cls(graph, goal)
+            while len(cls._cache) > cls.CACHE_SIZE:
+                cls._cache.popitem(last=False)
+        return cls._cache[key]
+
+    def _compute(self):
+        graph = self.graph
+        indptr, indices = graph.indptr, graph.indices
+        costs = graph.costs.ravel().astype(np.int32)
+        dist = np.full(graph.size, UNREACHABLE, dtype=np.int32)
+        if graph.blocked.flat[self.goal]:
+            return dist
+        dist[self.goal] = 0
+
+        # Dial's algorithm run a whole bucket at a time; with unit costs each bucket is one BFS layer
+        buckets = {0: [np.array([self.goal], dtype=np.int32)]}
+        while buckets:
+            level = min(buckets)
+            nodes = np.unique(np.concatenate(buckets.pop(level)))
+            nodes = nodes[dist[nodes] == level]
+            if not nodes.size:
+                continue
+            starts, counts = indptr[nodes], indptr[nodes + 1] - indptr[nodes]
+            total = int(counts.sum())
+            if not total:
+                continue
+            offsets = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(total)
+            neighbors = indices[offsets]
+            # stepping from a neighbour onto a node costs that node's terrain times the step length
+            candidate = level + np.repeat(costs[nodes], counts) * graph.steps[offsets]
+            better = candidate < dist[neighbors]
+            neighbors, candidate = neighbors[better], candidate[better]
+            np.minimum.at(dist, neighbors, candidate)
+            kept = dist[neighbors] == candidate
+            neighbors, candidate = neighbors[kept], candidate[kept]
+            for value in np.unique(candidate).tolist():
+                buckets.setdefault(value, []).append(neighbors[candidate == value])
+        return dist
+
+    def distance(self, node):
+        value = int(self.dist[node])
+        return None if value == UNREACHABLE else value
+
+    def next_step(self, node):
+        graph = self.graph
+        lo, hi = graph.indptr[node], graph.indptr[node + 1]
+        neighbors = graph.indices[lo:hi]
+        if not len(neighbors):
+            return None
+        # entering a neighbour costs its terrain value; pick the one that stays on the gradient
+        totals = self.dist[neighbors].astype(np.int64) + graph.weights[lo:hi]
+        return int(neighbors[np.argmin(totals)])
+
+    def path_generator(self, start):
+        if self.distance(start) is None:
+            return None
+        node, path = start, [start]
+        yield start
+        while node != self.goal:
+            node = self.next_step(node)
+            path.append(node)
+            yield node
+        return path
+
+    def path_from(self, start):
+        search = self.path_generator(start)
+        try:
+            while True:
+                next(search)
+        except StopIteration as e:
+            return e.value
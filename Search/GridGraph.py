@@ -0,0 +1,101 @@
+import hashlib
+import numpy as np
+from functools import cached_property
+
+
+class GridGraph:
+    DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+    DIAGONALS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+    # diagonal maps scale every step by 10 so a diagonal (14 ~ 10 * sqrt 2) stays an integer key
+    STRAIGHT_COST = 10
+    DIAGONAL_COST = 14
+    CORNER_RULES = ("none", "one", "allow")
+
+    def __init__(self, blocked, costs=None, diagonal=False, corner_cutting="none"):
+        if corner_cutting not in self.CORNER_RULES:
+            raise ValueError(f"Corner cutting must be one of {', '.join(self.CORNER_RULES)}")
+        self.diagonal = diagonal
+        self.corner_cutting = corner_cutting
+        self.offsets = self.DIRECTIONS + self.DIAGONALS if diagonal else self.DIRECTIONS
+        self.scale = self.STRAIGHT_COST if diagonal else 1
+        self.diagonal_saving = self.DIAGONAL_COST - 2 * self.STRAIGHT_COST if diagonal else 0
+        self.step_costs = np.array([self.scale] * 4 + [self.DIAGONAL_COST] * (len(self.offsets) - 4), dtype=np.int32)
+        self.blocked = np.ascontiguousarray(blocked, dtype=bool)
+        self.n, self.m = self.blocked.shape
+        self.size = self.n * self.m
+        if costs is None:
+            self.costs = np.ones(self.blocked.shape, dtype=np.uint8)
+        else:
+            self.costs = np.ascontiguousarray(costs, dtype=np.uint8)
+            if self.costs.shape != self.blocked.shape or self.costs.min(initial=1) < 1:
+                raise ValueError("Terrain costs must be positive and match the grid shape")
+        self.indptr, self.indices, self.steps = self._build_adjacency()
+        self.weights = self.costs.ravel()[self.indices].astype(np.int32) * self.steps
+        self.min_cost = int(self.costs[~self.blocked].min(initial=1))
+        self.max_weight = int(self.weights.max(initial=1))
+
+    @classmethod
+    def from_colors(cls, grid, obstacle_color, terrain_costs=None, diagonal=False, corner_cutting="none"):
+        grid = np.asarray(grid)
+        costs = None
+        if terrain_costs:
+            costs = np.ones(grid.shape, dtype=np.uint8)
+            for color, cost in terrain_costs.items():
+                costs[grid == color] = cost
+        return cls(grid == obstacle_color, costs, diagonal, corner_cutting)
+
+    def _build_adjacency(self):
+        n, m = self.n, self.m
+        free = ~self.blocked
+        table = np.full((n, m, len(self.offsets)), -1, dtype=np.int32)
+        ids = np.arange(self.size, dtype=np.int32).reshape(n, m)
+
+        for k, (di, dj) in enumerate(self.offsets):
+            src_rows = slice(max(0, -di), n - max(0, di))
+            src_cols = slice(max(0, -dj), m - max(0, dj))
+            dst_rows = slice(max(0, di), n - max(0, -di))
+            dst_cols = slice(max(0, dj), m - max(0, -dj))
+            ok = free[src_rows, src_cols] & free[dst_rows, dst_cols]
+            if di and dj and self.corner_cutting != "allow":
+                # the cells flanking a diagonal move sit in its target row and its target column
+                vertical = free[dst_rows, src_cols]
+                horizontal = free[src_rows, dst_cols]
+                ok &= (vertical & horizontal) if self.corner_cutting == "none" else (vertical | horizontal)
+            table[src_rows, src_cols, k] = np.where(ok, ids[dst_rows, dst_cols], -1)
+
+        table = table.reshape(self.size, len(self.offsets))
+        valid = table >= 0
+        indptr = np.zeros(self.size + 1, dtype=np.int32)
+        np.cumsum(valid.sum(axis=1), out=indptr[1:])
+        steps = np.broadcast_to(self.step_costs, table.shape)[valid]
+        return indptr, table[valid], steps
+
+    @cached_property
+    def key(self):
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(np.array(self.blocked.shape, dtype=np.int64).tobytes())
+        digest.update(self.blocked.tobytes())
+        digest.update(self.costs.tobytes())
+        digest.update(f"{int(self.diagonal)}{self.corner_cutting}".encode())
+        return digest.hexdigest()
+
+    def neighbors(self, node):
+        return self.indices[self.indptr[node]:self.indptr[node + 1]]
+
+    def step_cost(self, a, b):
+        ai, aj = divmod(int(a), self.m)
+        bi, bj = divmod(int(b), self.m)
+        step = self.DIAGONAL_COST if ai != bi and aj != bj else self.scale
+        return int(self.costs.flat[b]) * step
+
+    def path_cost(self, cells):
+        return sum(self.step_cost(self.to_node(a), self.to_node(b)) for a, b in zip(cells, cells[1:]))
+
+    def to_node(self, cell):
+        return cell[0] * self.m + cell[1]
+
+    def to_cell(self, node):
+        return divmod(int(node), self.m)
+
+    def is_free(self, node):
+        return not self.blocked.flat[node]
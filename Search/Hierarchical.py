@@ -0,0 +1,256 @@
+import heapq
+import numpy as np
+from collections import OrderedDict
+
+
+class HierarchicalPathFinder:
+    MAX_ENTRANCE_WIDTH = 6
+    CACHE_SIZE = 4
+    _cache = OrderedDict()
+
+    def __init__(self, blocked, costs, cluster_size=16):
+        self.blocked = np.array(blocked, dtype=bool)
+        self.costs = np.array(costs, dtype=np.uint8)
+        self.n, self.m = self.blocked.shape
+        self.size = cluster_size
+        self.cluster_rows = -(-self.n // cluster_size)
+        self.cluster_cols = -(-self.m // cluster_size)
+        self.borders = {}
+        self.nodes = {}
+        self.intra = {}
+        self.inter = {}
+        self._local_graphs = {}
+        self._segments = {}
+        self.min_cost = int(self.costs[~self.blocked].min(initial=1))
+        clusters = range(self.cluster_rows * self.cluster_cols)
+        for cluster in clusters:
+            for border in self._cluster_borders(cluster):
+                if border[0] == cluster:
+                    self._build_border(border)
+        for cluster in clusters:
+            self._build_cluster(cluster)
+
+    @classmethod
+    def for_graph(cls, graph, cluster_size=16):
+        key = (graph.key, cluster_size)
+        if key in cls._cache:
+            cls._cache.move_to_end(key)
+            return cls._cache[key]
+
+        # reuse the latest abstraction of a same-sized map and only repair what changed
+        for old_key in reversed(cls._cache):
+            finder = cls._cache[old_key]
+            if old_key[1] == cluster_size and finder.blocked.shape == graph.blocked.shape:
+                del cls._cache[old_key]
+                finder.update(graph.blocked, graph.costs)
+                break
+        else:
+            finder = cls(graph.blocked, graph.costs, cluster_size)
+
+        cls._cache[key] = finder
+        while len(cls._cache) > cls.CACHE_SIZE:
+            cls._cache.popitem(last=False)
+        return finder
+
+    def update(self, blocked, costs):
+        changed = np.flatnonzero((self.blocked != blocked) | (self.costs != costs))
+        if not len(changed):
+            return set()
+        self.blocked = np.array(blocked, dtype=bool)
+        self.costs = np.array(costs, dtype=np.uint8)
+        self.min_cost = int(self.costs[~self.blocked].min(initial=1))
+
+        touched = {self.cluster_of(node) for node in changed.tolist()}
+        borders = {border for cluster in touched for border in self._cluster_borders(cluster)}
+        for border in borders:
+            self._build_border(border)
+        rebuilt = touched | {cluster for border in borders for cluster in border}
+        for cluster in rebuilt:
+            self._build_cluster(cluster)
+        return rebuilt
+
+    def cluster_of(self, node):
+        i, j = divmod(node, self.m)
+        return (i // self.size) * self.cluster_cols + j // self.size
+
+    def _bounds(self, cluster):
+        r, c = divmod(cluster, self.cluster_cols)
+        return (r * self.size, min((r + 1) * self.size, self.n),
+                c * self.size, min((c + 1) * self.size, self.m))
+
+    def _cluster_borders(self, cluster):
+        r, c = divmod(cluster, self.cluster_cols)
+        borders = []
+        if c + 1 < self.cluster_cols:
+            borders.append((cluster, cluster + 1))
+        if r + 1 < self.cluster_rows:
+            borders.append((cluster, cluster + self.cluster_cols))
+        if c > 0:
+            borders.append((cluster - 1, cluster))
+        if r > 0:
+            borders.append((cluster - self.cluster_cols, cluster))
+        return borders
+
+    def _build_border(self, border):
+        for pair in self.borders.get(border, ()):
+            for u, v in (pair, pair[::-1]):
+                del self.inter[u][v]
+                if not self.inter[u]:
+                    del self.inter[u]
+
+        first, second = border
+        top, bottom, left, right = self._bounds(first)
+        if first // self.cluster_cols == second // self.cluster_cols:
+            crossing = [(i * self.m + right - 1, i * self.m + right) for i in range(top, bottom)]
+        else:
+            crossing = [((bottom - 1) * self.m + j, bottom * self.m + j) for j in range(left, right)]
+
+        flat = self.blocked.ravel()
+        pairs, segment = [], []
+        for u, v in crossing + [(None, None)]:
+            if u is not None and not flat[u] and not flat[v]:
+                segment.append((u, v))
+                continue
+            if len(segment) >= self.MAX_ENTRANCE_WIDTH:
+                pairs.extend((segment[0], segment[-1]))
+            elif segment:
+                pairs.append(segment[len(segment) // 2])
+            segment = []
+
+        costs = self.costs.ravel()
+        for u, v in pairs:
+            self.inter.setdefault(u, {})[v] = int(costs[v])
+            self.inter.setdefault(v, {})[u] = int(costs[u])
+        self.borders[border] = pairs
+
+    def _build_cluster(self, cluster):
+        self._local_graphs.pop(cluster, None)
+        self._segments = {pair: path for pair, path in self._segments.items()
+                          if self.cluster_of(pair[0]) != cluster}
+        nodes = set()
+        for border in self._cluster_borders(cluster):
+            for pair in self.borders.get(border, ()):
+                nodes.update(node for node in pair if self.cluster_of(node) == cluster)
+        self.nodes[cluster] = nodes
+        self.intra[cluster] = {}
+        for node in nodes:
+            dist, _ = self._local_search(node, cluster, nodes)
+            self.intra[cluster][node] = [(other, cost) for other, cost in dist.items() if other != node]
+
+    def _local_graph(self, cluster):
+        graph = self._local_graphs.get(cluster)
+        if graph is None:
+            top, bottom, left, right = self._bounds(cluster)
+            flat, costs, m = self.blocked.ravel(), self.costs.ravel(), self.m
+            cells = [i * m + j for i in range(top, bottom) for j in range(left, right) if not flat[i * m + j]]
+            index = {cell: k for k, cell in enumerate(cells)}
+            adjacency = []
+            for cell in cells:
+                i, j = divmod(cell, m)
+                adjacency.append([index[x * m + y] for x, y in ((i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1))
+                                  if top <= x < bottom and left <= y < right and x * m + y in index])
+            weights = costs[cells].tolist()
+            graph = cells, index, adjacency, weights
+            self._local_graphs[cluster] = graph
+        return graph
+
+    def _local_search(self, source, cluster, targets=None, reverse=False):
+        cells, index, adjacency, weights = self._local_graph(cluster)
+        remaining = {index[node] for node in targets if node in index} if targets is not None else None
+        start = index[source]
+        dist = [-1] * len(cells)
+        parent = [-1] * len(cells)
+        dist[start] = 0
+        done = [False] * len(cells)
+        pq = [(0, start)]
+        while pq:
+            g, u = heapq.heappop(pq)
+            if done[u]:
+                continue
+            done[u] = True
+            if remaining is not None:
+                remaining.discard(u)
+                if not remaining:
+                    break
+            for v in adjacency[u]:
+                new_g = g + (weights[u] if reverse else weights[v])
+                if dist[v] < 0 or new_g < dist[v]:
+                    dist[v] = new_g
+                    parent[v] = u
+                    heapq.heappush(pq, (new_g, v))
+        reached = targets if targets is not None else cells
+        found = {node: dist[index[node]] for node in reached if node in index and done[index[node]]}
+        return found, (cells, index, parent)
+
+    def _local_path(self, source, target):
+        if (source, target) in self._segments:
+            return self._segments[(source, target)]
+        cluster = self.cluster_of(source)
+        _, (cells, index, parent) = self._local_search(source, cluster, {target})
+        path, k = [], index[target]
+        while k != -1:
+            path.append(cells[k])
+            k = parent[k]
+        path.reverse()
+        # only segments between entrances are reused; query endpoints change every call
+        if source in self.nodes[cluster] and target in self.nodes[cluster]:
+            self._segments[(source, target)] = path
+        return path
+
+    def heuristic(self, node, target):
+        i, j = divmod(node, self.m)
+        x, y = divmod(target, self.m)
+        return abs(i - x) + abs(j - y)
+
+    def search_generator(self, source, target):
+        flat = self.blocked.ravel()
+        if flat[source] or flat[target]:
+            return None
+        if source == target:
+            return [source]
+
+        source_cluster, target_cluster = self.cluster_of(source), self.cluster_of(target)
+        exits = self.nodes[source_cluster] | ({target} if source_cluster == target_cluster else set())
+        source_edges = list(self._local_search(source, source_cluster, exits)[0].items())
+        target_edges, _ = self._local_search(target, target_cluster, self.nodes[target_cluster], reverse=True)
+
+        min_cost = self.min_cost
+        best = {source: 0}
+        parent = {source: None}
+        pq = [(self.heuristic(source, target) * min_cost, 0, source)]
+        while pq:
+            f, g, node = heapq.heappop(pq)
+            if g > best[node]:
+                continue
+            yield node
+            if node == target:
+                return self._refine(parent, target)
+
+            edges = list(self.inter.get(node, {}).items())
+            if node in self.nodes[self.cluster_of(node)]:
+                edges.extend(self.intra[self.cluster_of(node)][node])
+            if node == source:
+                edges.extend(source_edges)
+            if node in target_edges:
+                edges.append((target, target_edges[node]))
+            for neighbor, cost in edges:
+                new_g = g + cost
+                if new_g < best.get(neighbor, new_g + 1):
+                    best[neighbor] = new_g
+                    parent[neighbor] = node
+                    heapq.heappush(pq, (new_g + self.heuristic(neighbor, target) * min_cost, new_g, neighbor))
+        return None
+
+    def _refine(self, parent, target):
+        abstract = [target]
+        while parent[abstract[-1]] is not None:
+            abstract.append(parent[abstract[-1]])
+        abstract.reverse()
+
+        path = [abstract[0]]
+        for a, b in zip(abstract, abstract[1:]):
+            if b in self.inter.get(a, ()):
+                path.append(b)
+            else:
+                path.extend(self._local_path(a, b)[1:])
+        return path
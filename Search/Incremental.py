@@ -0,0 +1,156 @@
+import heapq
+import numpy as np
+from GridGraph import GridGraph
+
+INF = float('inf')
+
+
+class DStarLite:
+    def __init__(self, blocked, costs, start, goal, diagonal=False, corner_cutting="none"):
+        if corner_cutting not in GridGraph.CORNER_RULES:
+            raise ValueError(f"Corner cutting must be one of {', '.join(GridGraph.CORNER_RULES)}")
+        blocked = np.asarray(blocked, dtype=bool)
+        self.n, self.m = blocked.shape
+        # step costs and the octile heuristic follow GridGraph, so paths cost the same as A*'s
+        self.diagonal = diagonal
+        self.corner_cutting = corner_cutting
+        self.offsets = GridGraph.DIRECTIONS + GridGraph.DIAGONALS if diagonal else GridGraph.DIRECTIONS
+        self.scale = GridGraph.STRAIGHT_COST if diagonal else 1
+        self.diagonal_saving = GridGraph.DIAGONAL_COST - 2 * GridGraph.STRAIGHT_COST if diagonal else 0
+        self.blocked = bytearray(blocked.tobytes())
+        self.costs = bytearray(np.asarray(costs, dtype=np.uint8).tobytes())
+        self.start = start
+        self.goal = goal
+        self.last_start = start
+        self.km = 0
+        self.g = [INF] * (self.n * self.m)
+        self.rhs = [INF] * (self.n * self.m)
+        self.queue = []
+        self.keys = {}
+        self.rhs[goal] = 0
+        self._push(goal)
+
+    def heuristic(self, a, b):
+        ai, aj = divmod(a, self.m)
+        bi, bj = divmod(b, self.m)
+        di, dj = abs(ai - bi), abs(aj - bj)
+        return self.scale * (di + dj) + self.diagonal_saving * min(di, dj)
+
+    def neighbors(self, node):
+        i, j = divmod(node, self.m)
+        if self.diagonal:
+            n, m = self.n, self.m
+            return [(i + di) * m + j + dj for di, dj in self.offsets if 0 <= i + di < n and 0 <= j + dj < m]
+        result = []
+        if i > 0:
+            result.append(node - self.m)
+        if i < self.n - 1:
+            result.append(node + self.m)
+        if j > 0:
+            result.append(node - 1)
+        if j < self.m - 1:
+            result.append(node + 1)
+        return result
+
+    def cost(self, a, b):
+        if self.blocked[a] or self.blocked[b]:
+            return INF
+        if not self.diagonal:
+            return self.costs[b]
+        ai, aj = divmod(a, self.m)
+        bi, bj = divmod(b, self.m)
+        if ai == bi or aj == bj:
+            return self.costs[b] * self.scale
+        if self.corner_cutting != "allow":
+            # the same flanking cells GridGraph checks: one in the target row, one in the target column
+            vertical = not self.blocked[bi * self.m + aj]
+            horizontal = not self.blocked[ai * self.m + bj]
+            if not ((vertical and horizontal) if self.corner_cutting == "none" else (vertical or horizontal)):
+                return INF
+        return self.costs[b] * GridGraph.DIAGONAL_COST
+
+    def calculate_key(self, node):
+        best = min(self.g[node], self.rhs[node])
+        return best + self.heuristic(self.start, node) + self.km, best
+
+    def _push(self, node):
+        key = self.calculate_key(node)
+        self.keys[node] = key
+        heapq.heappush(self.queue, (key, node))
+
+    def _top(self):
+        while self.queue:
+            key, node = self.queue[0]
+            if self.keys.get(node) == key:
+                return key, node
+            heapq.heappop(self.queue)
+        return None
+
+    def update_vertex(self, node):
+        if node != self.goal:
+            g, rhs = self.g, INF
+            for neighbor in self.neighbors(node):
+                value = self.cost(node, neighbor) + g[neighbor]
+                if value < rhs:
+                    rhs = value
+            self.rhs[node] = rhs
+        self.keys.pop(node, None)
+        if self.g[node] != self.rhs[node]:
+            self._push(node)
+
+    def compute_generator(self):
+        g, rhs = self.g, self.rhs
+        while True:
+            top = self._top()
+            if top is None:
+                break
+            key, node = top
+            if key >= self.calculate_key(self.start) and rhs[self.start] == g[self.start]:
+                break
+            new_key = self.calculate_key(node)
+            if key < new_key:
+                self._push(node)
+                continue
+            heapq.heappop(self.queue)
+            del self.keys[node]
+            yield node
+            if g[node] > rhs[node]:
+                g[node] = rhs[node]
+                for neighbor in self.neighbors(node):
+                    self.update_vertex(neighbor)
+            else:
+                g[node] = INF
+                for neighbor in self.neighbors(node) + [node]:
+                    self.update_vertex(neighbor)
+        return self.path()
+
+    def update(self, blocked, costs):
+        new_blocked = np.asarray(blocked, dtype=bool).ravel().view(np.uint8)
+        new_costs = np.asarray(costs, dtype=np.uint8).ravel()
+        changed = np.flatnonzero((np.frombuffer(self.blocked, dtype=np.uint8) != new_blocked) |
+                                 (np.frombuffer(self.costs, dtype=np.uint8) != new_costs)).tolist()
+        for node in changed:
+            self.blocked[node] = new_blocked[node]
+            self.costs[node] = new_costs[node]
+        # on diagonal maps a cell also gates the corner moves between its neighbours, whose sources are among them
+        affected = set(changed)
+        for node in changed:
+            affected.update(self.neighbors(node))
+        for node in affected:
+            self.update_vertex(node)
+        return changed
+
+    def move_start(self, start):
+        if start != self.start:
+            self.km += self.heuristic(self.last_start, start)
+            self.last_start = start
+            self.start = start
+
+    def path(self):
+        if self.g[self.start] == INF:
+            return None
+        node, path = self.start, [self.start]
+        while node != self.goal and len(path) <= len(self.g):
+            node = min(self.neighbors(node), key=lambda s: self.cost(node, s) + self.g[s])
+            path.append(node)
+        return path if node == self.goal else None
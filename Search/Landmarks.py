@@ -0,0 +1,96 @@
+import os
+import numpy as np
+from collections import OrderedDict
+from FlowField import DistanceField, UNREACHABLE
+
+NO_BOUND = 1 << 40
+
+
+class LandmarkHeuristic:
+    CACHE_SIZE = 4
+    _cache = OrderedDict()
+
+    def __init__(self, graph, count=8, seed=0, table=None, landmarks=None):
+        self.graph = graph
+        if table is None:
+            landmarks, table = self._select(count, seed)
+        self.landmarks = list(landmarks)
+        # one row per node so a lookup reads all landmark distances from contiguous memory
+        self.table = table
+
+    @classmethod
+    def for_graph(cls, graph, count=8, cache_dir=None):
+        key = (graph.key, count)
+        if key in cls._cache:
+            cls._cache.move_to_end(key)
+            return cls._cache[key]
+
+        filename = os.path.join(cache_dir, f"landmarks-{graph.key}-{count}.npz") if cache_dir else None
+        if filename and os.path.exists(filename):
+            alt = cls.load(filename, graph)
+        else:
+            alt = cls(graph, count)
+            if filename:
+                os.makedirs(cache_dir, exist_ok=True)
+                alt.save(filename)
+
+        cls._cache[key] = alt
+        while len(cls._cache) > cls.CACHE_SIZE:
+            cls._cache.popitem(last=False)
+        return alt
+
+    def _select(self, count, seed):
+        graph = self.graph
+        free = np.flatnonzero(~graph.blocked.ravel())
+        table = np.full((graph.size, 0), -1, dtype=np.int32)
+        if not len(free):
+            return [], table
+
+        # farthest-point selection: each landmark is the node worst covered by the ones before it
+        closest = np.full(graph.size, NO_BOUND, dtype=np.int64)
+        node = int(np.random.default_rng(seed).choice(free))
+        dist = DistanceField(graph, node).dist
+        landmarks, columns = [], []
+        for _ in range(min(count, len(free))):
+            score = np.where(dist == UNREACHABLE, NO_BOUND, dist)
+            np.minimum(closest, score, out=closest)
+            candidates = np.where(graph.blocked.ravel(), -1, closest)
+            candidates[landmarks] = -1
+            node = int(np.argmax(candidates))
+            if candidates[node] <= 0:
+                break
+            dist = DistanceField(graph, node).dist
+            landmarks.append(node)
+            columns.append(np.where(dist == UNREACHABLE, -1, dist).astype(np.int32))
+        if columns:
+            table = np.ascontiguousarray(np.stack(columns, axis=1))
+        return landmarks, table
+
+    def heuristic(self, target):
+        table = self.table
+        offsets = table[target].astype(np.int64)
+        # landmarks the target cannot reach say nothing, and -1 entries elsewhere never win the max
+        offsets[offsets < 0] = NO_BOUND
+        if not len(offsets):
+            return lambda node: 0
+
+        # A* asks for the same node again on every push and pop, so each bound is computed once
+        memo = {}
+
+        def estimate(node):
+            value = memo.get(node)
+            if value is None:
+                value = memo[node] = max(int((table[node] - offsets).max()), 0)
+            return value
+        return estimate
+
+    def save(self, filename):
+        np.savez(filename, key=np.array(self.graph.key), landmarks=np.array(self.landmarks, dtype=np.int64),
+                 table=self.table)
+
+    @classmethod
+    def load(cls, filename, graph):
+        with np.load(filename) as data:
+            if str(data['key']) != graph.key:
+                raise ValueError(f"{filename} was built for a different map")
+            return cls(graph, table=data['table'], landmarks=data['landmarks'].tolist())
@@ -0,0 +1,98 @@
+import random
+import numpy as np
+
+
+class MapGenerator:
+    GENERATORS = {
+        "Random": "random_fill",
+        "Backtracker": "recursive_backtracker",
+        "Prim": "prim_maze",
+        "Cave": "cellular_cave",
+    }
+
+    def __init__(self, seed=None):
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng = np.random.default_rng(self.seed)
+        self.random = random.Random(self.seed)
+
+    def generate(self, name, n, m, density=0.3):
+        return getattr(self, self.GENERATORS[name])(n, m, density)
+
+    def random_fill(self, n, m, density=0.3):
+        count = min(max(int(density * n * m), 0), n * m)
+        blocked = np.zeros(n * m, dtype=bool)
+        blocked[self.rng.choice(n * m, size=count, replace=False)] = True
+        return blocked.reshape(n, m)
+
+    def _lattice_neighbors(self, node, rows, cols):
+        r, c = divmod(node, cols)
+        options = []
+        if r > 0:
+            options.append(node - cols)
+        if r < rows - 1:
+            options.append(node + cols)
+        if c > 0:
+            options.append(node - 1)
+        if c < cols - 1:
+            options.append(node + 1)
+        return options
+
+    def _carve(self, n, m, rows, cols, parents, children):
+        # maze cells sit on odd coordinates, passages on the midpoint between two of them
+        blocked = np.ones((n, m), dtype=bool)
+        blocked[1:2 * rows:2, 1:2 * cols:2] = False
+        a_r, a_c = np.divmod(np.array(parents, dtype=np.int64), cols)
+        b_r, b_c = np.divmod(np.array(children, dtype=np.int64), cols)
+        blocked[a_r + b_r + 1, a_c + b_c + 1] = False
+        return blocked
+
+    def recursive_backtracker(self, n, m, density=None):
+        rows, cols = (n - 1) // 2, (m - 1) // 2
+        if rows < 1 or cols < 1:
+            return np.zeros((n, m), dtype=bool)
+        visited = bytearray(rows * cols)
+        start = self.random.randrange(rows * cols)
+        visited[start] = 1
+        stack, parents, children = [start], [], []
+        while stack:
+            node = stack[-1]
+            options = [v for v in self._lattice_neighbors(node, rows, cols) if not visited[v]]
+            if not options:
+                stack.pop()
+                continue
+            nxt = options[self.random.randrange(len(options))]
+            visited[nxt] = 1
+            parents.append(node)
+            children.append(nxt)
+            stack.append(nxt)
+        return self._carve(n, m, rows, cols, parents, children)
+
+    def prim_maze(self, n, m, density=None):
+        rows, cols = (n - 1) // 2, (m - 1) // 2
+        if rows < 1 or cols < 1:
+            return np.zeros((n, m), dtype=bool)
+        visited = bytearray(rows * cols)
+        start = self.random.randrange(rows * cols)
+        visited[start] = 1
+        frontier = [(start, v) for v in self._lattice_neighbors(start, rows, cols)]
+        parents, children = [], []
+        while frontier:
+            k = self.random.randrange(len(frontier))
+            frontier[k], frontier[-1] = frontier[-1], frontier[k]
+            node, nxt = frontier.pop()
+            if visited[nxt]:
+                continue
+            visited[nxt] = 1
+            parents.append(node)
+            children.append(nxt)
+            frontier.extend((nxt, v) for v in self._lattice_neighbors(nxt, rows, cols) if not visited[v])
+        return self._carve(n, m, rows, cols, parents, children)
+
+    def cellular_cave(self, n, m, density=0.45, steps=4):
+        blocked = self.rng.random((n, m)) < density
+        for _ in range(steps):
+            padded = np.pad(blocked, 1, constant_values=True).astype(np.uint8)
+            walls = sum(padded[1 + di:1 + di + n, 1 + dj:1 + dj + m]
+                        for di in (-1, 0, 1) for dj in (-1, 0, 1) if di or dj)
+            blocked = (walls >= 5) | (blocked & (walls >= 4))
+        return blocked
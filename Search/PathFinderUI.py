@@ -0,0 +1,933 @@
+import numpy as np
+import time
+import tkinter as tk
+from tkinter import ttk
+import tkinter.messagebox as messagebox
+import tkinter.filedialog as filedialog
+from PathFinder import PathFinder
+from GridGraph import GridGraph
+from Cooperative import CooperativePlanner
+from MapGenerator import MapGenerator
+from FlowField import DistanceField, UNREACHABLE
+from Components import ComponentLabels
+from SearchTrace import SearchTrace, TraceRecorder
+
+
+class GridCanvas:
+    MAX_CELL_SIZE = 40
+    FULL_REDRAW_RATIO = 0.25
+    STALE = 255
+
+    def __init__(self, parent, palette, bg, line_color, on_click):
+        self.palette = palette
+        self.rgb = np.array([[int(color[k:k + 2], 16) for k in (1, 3, 5)] for color in palette], dtype=np.uint8)
+        self.line_rgb = np.array([int(line_color[k:k + 2], 16) for k in (1, 3, 5)], dtype=np.uint8)
+        self.on_click = on_click
+        self.n = 0
+        self.m = 0
+        self.cell_size = 1
+        self.gap = 0
+        self.shown = None
+        self.image = None
+
+        self.frame = tk.Frame(parent, bg=bg)
+        self.frame.pack(fill='both', expand=True)
+        self.canvas = tk.Canvas(self.frame, bg=bg, highlightthickness=0)
+        y_scroll = ttk.Scrollbar(self.frame, orient='vertical', command=self.canvas.yview)
+        x_scroll = ttk.Scrollbar(self.frame, orient='horizontal', command=self.canvas.xview)
+        self.canvas.configure(yscrollcommand=y_scroll.set, xscrollcommand=x_scroll.set)
+        y_scroll.pack(side='right', fill='y')
+        x_scroll.pack(side='bottom', fill='x')
+        self.canvas.pack(side='left', fill='both', expand=True)
+        self.image_item = self.canvas.create_image(0, 0, anchor='nw')
+        self.canvas.bind('<Button-1>', self._handle_click)
+
+    def resize(self, n, m):
+        self.canvas.update_idletasks()
+        width = max(self.canvas.winfo_width(), 1)
+        height = max(self.canvas.winfo_height(), 1)
+        self.n, self.m = n, m
+        self.cell_size = max(1, min(self.MAX_CELL_SIZE, width // m, height // n))
+        self.gap = 1 if self.cell_size >= 4 else 0
+        self.shown = None
+        self.canvas.configure(scrollregion=(0, 0, m * self.cell_size, n * self.cell_size))
+
+    def draw(self, codes):
+        self.draw_pixels(self.rgb[codes])
+        self.shown = codes.copy()
+
+    def draw_pixels(self, rgb):
+        size = self.cell_size
+        pixels = np.repeat(np.repeat(rgb, size, axis=0), size, axis=1)
+        if self.gap:
+            pixels[size - 1::size, :] = self.line_rgb
+            pixels[:, size - 1::size] = self.line_rgb
+        header = f"P6 {self.m * size} {self.n * size} 255\n".encode()
+        self.image = tk.PhotoImage(data=header + pixels.tobytes(), format='PPM')
+        self.canvas.itemconfig(self.image_item, image=self.image)
+        # raw pixels have no palette codes, so every cell counts as changed on the next update
+        self.shown = np.full((self.n, self.m), self.STALE, dtype=np.uint8)
+
+    def update(self, codes):
+        if self.shown is None:
+            self.draw(codes)
+            return
+        changed = np.flatnonzero(codes != self.shown)
+        if len(changed) > self.FULL_REDRAW_RATIO * codes.size:
+            self.draw(codes)
+            return
+        flat = codes.ravel()
+        for node in changed.tolist():
+            i, j = divmod(node, self.m)
+            self.paint(i, j, flat[node])
+
+    def paint(self, i, j, code):
+        if self.shown[i, j] == code:
+            return
+        self.shown[i, j] = code
+        size = self.cell_size
+        x, y = j * size, i * size
+        self.image.put(self.palette[code], to=(x, y, x + size - self.gap, y + size - self.gap))
+
+    def _handle_click(self, event):
+        if not self.n:
+            return
+        j = int(self.canvas.canvasx(event.x)) // self.cell_size
+        i = int(self.canvas.canvasy(event.y)) // self.cell_size
+        if 0 <= i < self.n and 0 <= j < self.m:
+            self.on_click(i, j)
+
+    def destroy(self):
+        self.frame.destroy()
+
+
+class TraceReplay:
+    def __init__(self, ui, traces):
+        self.ui = ui
+        self.traces = traces
+        self.position = 0
+        self.playing = False
+        self.after_id = None
+        self.steps = max(trace.steps for trace in traces)
+
+        self.window = tk.Toplevel(ui.root)
+        self.window.title("Trace Replay")
+        self.window.geometry("1280x720")
+        self.window.configure(bg=ui.bg_color)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        controls = tk.Frame(self.window, bg=ui.bg_color)
+        controls.pack(pady=10)
+        button_style = {'bg': ui.button_bg, 'fg': ui.button_fg, 'activebackground': ui.active_bg,
+                        'font': ui.text_font, 'border': 0, 'relief': 'flat', 'padx': 15, 'pady': 8}
+        self.play_btn = tk.Button(controls, text="Play", **button_style, command=self.toggle_play)
+        self.play_btn.grid(row=0, column=0, padx=5)
+        self.scrubber = tk.Scale(controls, from_=0, to=self.steps, orient='horizontal', length=600,
+                                 showvalue=False, command=self.seek, bg=ui.bg_color, fg='white',
+                                 highlightthickness=0, troughcolor='#636e72')
+        self.scrubber.grid(row=0, column=1, padx=10)
+        ttk.Label(controls, text="Speed:", background=ui.bg_color,
+                  font=ui.text_font, foreground='white').grid(row=0, column=2, padx=5)
+        self.speed_scale = ttk.Scale(controls, from_=0, to=100, orient='horizontal',
+                                     style='Custom.Horizontal.TScale')
+        self.speed_scale.set(40)
+        self.speed_scale.grid(row=0, column=3, padx=10)
+        self.info_label = tk.Label(self.window, font=ui.text_font, bg=ui.bg_color, fg='white')
+        self.info_label.pack(side='bottom', pady=5)
+
+        panels = tk.Frame(self.window, bg=ui.bg_color)
+        panels.pack(fill='both', expand=True, padx=10, pady=10)
+        cost_codes = {cost: ui.codes[color] for color, cost in ui.terrain_costs.items()}
+        self.views = []
+        for k, trace in enumerate(traces):
+            panel = tk.Frame(panels, bg=ui.bg_color)
+            panel.grid(row=0, column=k, sticky='nsew', padx=5)
+            panels.grid_columnconfigure(k, weight=1, uniform='trace')
+            panels.grid_rowconfigure(0, weight=1)
+            tk.Label(panel, text=f"{trace.algorithm}: {trace.steps} expansions", font=ui.header_font,
+                     bg=ui.bg_color, fg='white').pack()
+            renderer = GridCanvas(panel, ui.palette, ui.bg_color, ui.bg_color, lambda i, j: None)
+            base = np.full((trace.n, trace.m), ui.codes[ui.cell_color], dtype=np.uint8)
+            for cost, code in cost_codes.items():
+                base[trace.costs == cost] = code
+            base[trace.blocked] = ui.codes[ui.obstacle_color]
+            base.flat[trace.source] = ui.codes[ui.source_color]
+            base.flat[trace.target] = ui.codes[ui.dest_color]
+            self.views.append({'trace': trace, 'renderer': renderer, 'base': base, 'step': 0,
+                               'seen': np.zeros(trace.size, dtype=bool)})
+
+        self.window.update_idletasks()
+        for view in self.views:
+            view['renderer'].resize(view['trace'].n, view['trace'].m)
+        self.show(0)
+
+    def seek(self, value):
+        position = int(float(value))
+        if position != self.position:
+            self.show(position)
+
+    def show(self, position):
+        ui = self.ui
+        self.position = position
+        details = []
+        for view in self.views:
+            trace, step = view['trace'], min(position, view['trace'].steps)
+            # scrubbing backwards rebuilds from the file, forwards only applies the new events
+            if step >= view['step']:
+                trace.replay(view['seen'], view['step'], step)
+            else:
+                view['seen'] = trace.seen_at(step)
+            view['step'] = step
+
+            frame = view['base'].copy()
+            endpoints = frame >= ui.codes[ui.source_color]
+            frame[view['seen'].reshape(trace.n, trace.m) & ~endpoints] = ui.codes[ui.visited_color]
+            if step == trace.steps and trace.path:
+                path = np.array(trace.path[1:-1], dtype=np.intp)
+                frame.flat[path] = ui.codes[ui.path_color]
+            current = trace.current_at(step)
+            if current is not None and not endpoints.flat[current]:
+                frame.flat[current] = ui.codes[ui.current_color]
+            view['renderer'].update(frame)
+
+            event = trace.event_at(step)
+            details.append(f"{trace.algorithm} {step}/{trace.steps}" +
+                           (f" g={event[1]} f={event[2]}" if event and event[1] >= 0 else ""))
+        self.info_label.config(text="   |   ".join(details))
+
+    def toggle_play(self):
+        self.playing = not self.playing
+        self.play_btn.config(text="Pause" if self.playing else "Play")
+        if self.playing:
+            if self.position >= self.steps:
+                self.show(0)
+            self.tick()
+        elif self.after_id:
+            self.window.after_cancel(self.after_id)
+            self.after_id = None
+
+    def tick(self):
+        speed = self.speed_scale.get()
+        position = min(self.position + int(10 ** (speed / 20)), self.steps)
+        self.show(position)
+        self.scrubber.set(position)
+        if position >= self.steps:
+            self.toggle_play()
+            return
+        self.after_id = self.window.after(16, self.tick)
+
+    def close(self):
+        if self.after_id:
+            self.window.after_cancel(self.after_id)
+        self.window.destroy()
+
+
+# noinspection PyTypeChecker
+class GridUI:
+    def __init__(self, root):
+        self.dfs_rb = None
+        self.dijkstra_rb = None
+        self.hpa_rb = None
+        self.d_star_rb = None
+        self.flow_rb = None
+        self.field_btn = None
+        self.solve_btn = None
+        self.clear_path_btn = None
+        self.stop_btn = None
+        self.algo_var = None
+        self.random_btn = None
+        self.bfs_rb = None
+        self.a_star_rb = None
+        self.alt_rb = None
+        self.clear_btn = None
+        self.generate_btn = None
+        self.m_entry = None
+        self.n_entry = None
+        self.obstacle_scale = None
+        self.generator_box = None
+        self.seed_entry = None
+        self.visited_toggle = None
+        self.record_toggle = None
+        self.replay_btn = None
+        self.agent_toggle = None
+        self.add_agents_btn = None
+        self.window_entry = None
+        self.diagonal_toggle = None
+        self.corner_box = None
+        self.info_panel = None
+        self.root = root
+        self.root.title("Pathfinding Visualizer")
+        self.root.geometry("1280x720")
+        self.root.configure(bg='#2C3E50')
+
+        self.style = ttk.Style()
+        self.style.theme_use('clam')
+
+        self.bg_color = '#2C3E50'
+        self.button_bg = '#0984e3'
+        self.button_fg = 'white'
+        self.active_bg = '#0767b2'
+        self.cell_color = '#dfe6e9'
+        self.obstacle_color = '#2d3436'
+        self.source_color = '#0984e3'
+        self.dest_color = '#00b894'
+        self.visited_color = '#636e72'
+        self.current_color = '#fdcb6e'
+        self.path_color = '#ffeaa7'
+
+        self.header_font = ('Arial', 12, 'bold')
+        self.text_font = ('Arial', 10)
+
+        self.pathfinder = None
+        self.planner = None
+        self.components = None
+        self.n = 0
+        self.m = 0
+        self.source_pos = None
+        self.dest_pos = None
+        self.cells = np.zeros((0, 0), dtype=np.uint8)
+        self.algorithm = "BFS"
+        self.searching = False
+        self.step_delay = 5
+        self.frame_budget = 0.012
+        self.painted_visited = None
+        self.painted_current = None
+        self.states_explored = 0
+        self.stopped = False
+        self.after_id = None
+        self.search = None
+        self.show_visited = tk.BooleanVar(value=True)
+        self.record_trace = tk.BooleanVar(value=False)
+        self.agent_mode = tk.BooleanVar(value=False)
+        self.diagonal = tk.BooleanVar(value=False)
+        self.corner_rules = {"No Corners": "none", "One Corner": "one", "Cut Corners": "allow"}
+        self.agents = []
+        self.pending_agent = None
+        self.agent_paths = None
+        self.agent_time = 0
+        self.agent_summary = ""
+        self.agents_per_click = 10
+        self.terrain_costs = {self.cell_color: 1, '#fab1a0': 2, '#ff7675': 4, '#fd79a8': 8}
+        self.color_cycle = [self.cell_color, self.obstacle_color, '#fab1a0', '#ff7675', '#fd79a8']
+        self.palette = self.color_cycle + [self.source_color, self.dest_color, self.visited_color,
+                                           self.current_color, self.path_color]
+        self.codes = {color: code for code, color in enumerate(self.palette)}
+        self.cost_lut = np.array([self.terrain_costs.get(color, 1) for color in self.palette], dtype=np.uint8)
+
+        self.create_controls()
+        self.create_info_panel()
+        self.grid_frame = tk.Frame(self.root, bg=self.bg_color)
+        self.grid_frame.pack(fill='both', expand=True, padx=10, pady=10)
+        self.renderer = GridCanvas(self.grid_frame, self.palette, self.bg_color, self.bg_color, self.select_cells)
+        self.update_button_states()
+
+    def create_controls(self):
+        control_frame = tk.Frame(self.root, bg=self.bg_color)
+        control_frame.pack(pady=15)
+
+        ttk.Label(control_frame, text="Rows:", background=self.bg_color,
+                  font=self.text_font, foreground='white').grid(row=0, column=0, padx=5)
+        self.n_entry = ttk.Entry(control_frame, width=5, font=self.text_font)
+        self.n_entry.grid(row=0, column=1, padx=5)
+
+        ttk.Label(control_frame, text="Columns:", background=self.bg_color,
+                  font=self.text_font, foreground='white').grid(row=0, column=2, padx=5)
+        self.m_entry = ttk.Entry(control_frame, width=5, font=self.text_font)
+        self.m_entry.grid(row=0, column=3, padx=5)
+
+        button_style = {
+            'bg': self.button_bg,
+            'fg': self.button_fg,
+            'activebackground': self.active_bg,
+            'font': self.text_font,
+            'border': 0,
+            'relief': 'flat',
+            'padx': 15,
+            'pady': 8
+        }
+
+        self.generate_btn = tk.Button(control_frame, text="Generate Grid", **button_style, command=self.generate_grid)
+        self.generate_btn.grid(row=0, column=4, padx=5)
+
+        self.clear_btn = tk.Button(control_frame, text="Clear All", **button_style, command=self.clear_grid)
+        self.clear_btn.grid(row=0, column=5, padx=5)
+
+        self.random_btn = tk.Button(control_frame, text="Randomize", **button_style, command=self.randomize_grid)
+        self.random_btn.grid(row=0, column=6, padx=5)
+
+        self.algo_var = tk.StringVar(value="BFS")
+        radio_style = {'bg': self.bg_color, 'fg': 'white', 'font': self.text_font,
+                       'selectcolor': self.button_bg, 'activebackground': self.bg_color}
+
+        self.bfs_rb = tk.Radiobutton(control_frame, text="BFS", variable=self.algo_var,
+                                     value="BFS", **radio_style)
+        self.bfs_rb.grid(row=0, column=7, padx=5)
+        self.dfs_rb = tk.Radiobutton(control_frame, text="DFS", variable=self.algo_var,
+                                     value="DFS", **radio_style)
+        self.dfs_rb.grid(row=0, column=8, padx=5)
+        self.a_star_rb = tk.Radiobutton(control_frame, text="A*", variable=self.algo_var,
+                                        value="A*", **radio_style)
+
+        self.a_star_rb.grid(row=0, column=9, padx=5)
+        self.dijkstra_rb = tk.Radiobutton(control_frame, text="Dijkstra", variable=self.algo_var,
+                                          value="Dijkstra", **radio_style)
+        self.dijkstra_rb.grid(row=0, column=10, padx=5)
+        self.hpa_rb = tk.Radiobutton(control_frame, text="HPA*", variable=self.algo_var,
+                                     value="HPA*", **radio_style)
+        self.hpa_rb.grid(row=1, column=10, padx=5, pady=(10, 0))
+        self.d_star_rb = tk.Radiobutton(control_frame, text="D* Lite", variable=self.algo_var,
+                                        value="D* Lite", **radio_style)
+        self.d_star_rb.grid(row=1, column=11, padx=5, pady=(10, 0))
+        self.flow_rb = tk.Radiobutton(control_frame, text="Flow Field", variable=self.algo_var,
+                                      value="Flow Field", **radio_style)
+        self.flow_rb.grid(row=1, column=12, padx=5, pady=(10, 0))
+        self.field_btn = tk.Button(control_frame, text="Show Field", **button_style, command=self.show_distance_field)
+        self.field_btn.grid(row=1, column=13, padx=5, pady=(10, 0))
+
+        action_style = {**button_style, 'bg': '#00b894', 'activebackground': '#00997b'}
+        self.solve_btn = tk.Button(control_frame, text="Solve", **action_style, command=self.start_solving)
+        self.solve_btn.grid(row=0, column=11, padx=5)
+
+        self.stop_btn = tk.Button(control_frame, text="Stop",
+                                  **{**button_style, 'bg': '#d63031', 'activebackground': '#b02323'},
+                                  command=self.stop_animation, state=tk.DISABLED)
+        self.stop_btn.grid(row=0, column=12, padx=5)
+
+        self.clear_path_btn = tk.Button(control_frame, text="Clear Path", **button_style, command=self.clear_path)
+        self.clear_path_btn.grid(row=0, column=13, padx=5)
+
+        self.visited_toggle = tk.Checkbutton(
+            control_frame, text="Show Visited",
+            variable=self.show_visited,
+            command=self.toggle_visited_display,
+            bg=self.bg_color,
+            fg='white',
+            font=self.text_font,
+            activebackground=self.bg_color,
+            selectcolor=self.button_bg
+        )
+        self.visited_toggle.grid(row=0, column=14, padx=5)
+
+        self.obstacle_scale = ttk.Scale(control_frame, from_=1, to=60, orient='horizontal',
+                                        style='Custom.Horizontal.TScale')
+        self.obstacle_scale.set(30)
+        self.obstacle_scale.grid(row=0, column=15, padx=10)
+
+        ttk.Label(control_frame, text="Map:", background=self.bg_color,
+                  font=self.text_font, foreground='white').grid(row=1, column=4, padx=5, pady=(10, 0))
+        self.generator_box = ttk.Combobox(control_frame, values=list(MapGenerator.GENERATORS),
+                                          state="readonly", width=12, font=self.text_font)
+        self.generator_box.set("Random")
+        self.generator_box.grid(row=1, column=5, columnspan=2, padx=5, pady=(10, 0))
+
+        ttk.Label(control_frame, text="Seed:", background=self.bg_color,
+                  font=self.text_font, foreground='white').grid(row=1, column=7, padx=5, pady=(10, 0))
+        self.seed_entry = ttk.Entry(control_frame, width=12, font=self.text_font)
+        self.seed_entry.grid(row=1, column=8, padx=5, pady=(10, 0))
+        self.alt_rb = tk.Radiobutton(control_frame, text="ALT", variable=self.algo_var,
+                                     value="ALT", **radio_style)
+        self.alt_rb.grid(row=1, column=9, padx=5, pady=(10, 0))
+
+        self.record_toggle = tk.Checkbutton(
+            control_frame, text="Record Trace",
+            variable=self.record_trace,
+            bg=self.bg_color,
+            fg='white',
+            font=self.text_font,
+            activebackground=self.bg_color,
+            selectcolor=self.button_bg
+        )
+        self.record_toggle.grid(row=1, column=0, columnspan=2, padx=5, pady=(10, 0))
+        self.replay_btn = tk.Button(control_frame, text="Replay", **button_style, command=self.open_replay)
+        self.replay_btn.grid(row=1, column=2, columnspan=2, padx=5, pady=(10, 0))
+
+        ttk.Label(control_frame, text="Speed:", background=self.bg_color,
+                  font=self.text_font, foreground='white').grid(row=1, column=14, padx=5, pady=(10, 0))
+        self.speed_scale = ttk.Scale(control_frame, from_=0, to=100, orient='horizontal',
+                                     style='Custom.Horizontal.TScale')
+        self.speed_scale.set(40)
+        self.speed_scale.grid(row=1, column=15, padx=10, pady=(10, 0))
+
+        self.agent_toggle = tk.Checkbutton(
+            control_frame, text="Multi-Agent",
+            variable=self.agent_mode,
+            bg=self.bg_color,
+            fg='white',
+            font=self.text_font,
+            activebackground=self.bg_color,
+            selectcolor=self.button_bg
+        )
+        self.agent_toggle.grid(row=2, column=0, columnspan=2, padx=5, pady=(10, 0))
+        self.add_agents_btn = tk.Button(control_frame, text="Add Agents", **button_style, command=self.add_random_agents)
+        self.add_agents_btn.grid(row=2, column=2, columnspan=2, padx=5, pady=(10, 0))
+        ttk.Label(control_frame, text="Window:", background=self.bg_color,
+                  font=self.text_font, foreground='white').grid(row=2, column=4, padx=5, pady=(10, 0))
+        self.window_entry = ttk.Entry(control_frame, width=5, font=self.text_font)
+        self.window_entry.grid(row=2, column=5, padx=5, pady=(10, 0))
+
+        self.diagonal_toggle = tk.Checkbutton(
+            control_frame, text="8-Connected",
+            variable=self.diagonal,
+            bg=self.bg_color,
+            fg='white',
+            font=self.text_font,
+            activebackground=self.bg_color,
+            selectcolor=self.button_bg,
+            command=self.toggle_diagonal
+        )
+        self.diagonal_toggle.grid(row=2, column=6, columnspan=2, padx=5, pady=(10, 0))
+        self.corner_box = ttk.Combobox(control_frame, values=list(self.corner_rules),
+                                       state="readonly", width=12, font=self.text_font)
+        self.corner_box.set("No Corners")
+        self.corner_box.grid(row=2, column=8, columnspan=2, padx=5, pady=(10, 0))
+
+        self.style.configure('Custom.Horizontal.TScale',
+                             background=self.bg_color,
+                             troughcolor='#636e72',
+                             sliderthickness=15,
+                             gripcount=0)
+
+    def create_info_panel(self):
+        self.info_panel = tk.Label(self.root, text="States Explored: 0", font=self.text_font,
+                                   bg=self.bg_color, fg='white')
+        self.info_panel.pack(side='bottom', pady=5)
+
+    def generate_grid(self):
+        try:
+            new_n = int(self.n_entry.get())
+            new_m = int(self.m_entry.get())
+            if new_n <= 0 or new_m <= 0:
+                raise ValueError
+            if new_n > 2000 or new_m > 2000:
+                messagebox.showwarning("Large Grid", "Grid dimensions over 2000 may cause performance issues!")
+                return
+            self.n = new_n
+            self.m = new_m
+        except ValueError:
+            messagebox.showerror("Invalid Input", "Please enter positive integer values for grid dimensions")
+            return
+
+        self.reset_grid()
+        self.create_cells()
+
+    def create_cells(self):
+        self.renderer.resize(self.n, self.m)
+        self.renderer.draw(self.cells)
+
+    def select_cells(self, i, j):
+        if not self.searching and self.agent_mode.get():
+            self.place_agent(i, j)
+        elif not self.searching:
+            if self.source_pos is None:
+                self.source_pos = (i, j)
+                self.set_color(i, j, self.source_color)
+            elif self.dest_pos is None and (i, j) != self.source_pos:
+                self.dest_pos = (i, j)
+                self.set_color(i, j, self.dest_color)
+            elif (i, j) not in [self.source_pos, self.dest_pos]:
+                current_color = self.palette[self.cells[i, j]]
+                if current_color in [self.source_color, self.dest_color]:
+                    return
+                try:
+                    next_idx = (self.color_cycle.index(current_color) + 1) % len(self.color_cycle)
+                except ValueError:
+                    next_idx = 0
+                new_color = self.color_cycle[next_idx]
+                self.set_color(i, j, new_color)
+
+    def set_color(self, i, j, color):
+        self.cells[i, j] = self.codes[color]
+        self.renderer.paint(i, j, self.cells[i, j])
+        if self.components is not None:
+            node = i * self.m + j
+            if color == self.obstacle_color:
+                self.components.set_blocked(node)
+            else:
+                self.components.set_free(node)
+
+    def reset_cell_color(self, i, j):
+        self.renderer.paint(i, j, self.cells[i, j])
+
+    def clear_grid(self):
+        self.searching = False
+        self.states_explored = 0
+        self.info_panel.config(text="States Explored: 0")
+        self.reset_grid()
+        self.create_cells()
+        self.update_button_states()
+
+    def reset_grid(self):
+        self.cells = np.zeros((self.n, self.m), dtype=np.uint8)
+        self.source_pos = None
+        self.dest_pos = None
+        self.planner = None
+        self.components = None
+        self.agents = []
+        self.pending_agent = None
+
+    def randomize_grid(self):
+        try:
+            new_n = int(self.n)
+            new_m = int(self.m)
+            if new_n <= 0 or new_m <= 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Invalid Input", "Please enter valid dimensions first")
+            return
+
+        if new_n != self.n or new_m != self.m:
+            self.n = new_n
+            self.m = new_m
+            self.reset_grid()
+            self.create_cells()
+
+        seed = self.seed_entry.get().strip()
+        try:
+            generator = MapGenerator(int(seed) if seed else None)
+        except ValueError:
+            messagebox.showerror("Invalid Seed", "Please enter an integer seed or leave it empty")
+            return
+        blocked = generator.generate(self.generator_box.get(), self.n, self.m, self.obstacle_scale.get() / 100)
+        self.planner = None
+        self.components = None
+        endpoints = self.cells >= self.codes[self.source_color]
+        self.cells[:] = np.where(endpoints, self.cells,
+                                 np.where(blocked, self.codes[self.obstacle_color], self.codes[self.cell_color]))
+        self.renderer.update(self.cells)
+        self.info_panel.config(text=f"States Explored: 0   Seed: {generator.seed}")
+
+    def start_solving(self):
+        if self.agent_mode.get():
+            self.start_agents()
+            return
+        if not self.source_pos or not self.dest_pos:
+            messagebox.showerror("Missing Points", "Please set both start (blue) and end (green) points!")
+            return
+
+        if not self.searching:
+            self.searching = True
+            self.stopped = False
+            self.states_explored = 0
+            self.painted_visited = None
+            self.painted_current = None
+            self.clear_path()
+            self.initialize_pathfinder()
+            self.solve()
+            self.update_button_states()
+
+    def place_agent(self, i, j):
+        if self.cells[i, j] in (self.codes[self.obstacle_color], self.codes[self.source_color],
+                                self.codes[self.dest_color]):
+            return
+        if self.pending_agent is None:
+            self.pending_agent = (i, j)
+            self.set_color(i, j, self.source_color)
+        else:
+            self.agents.append((self.pending_agent, (i, j)))
+            self.pending_agent = None
+            self.set_color(i, j, self.dest_color)
+            self.info_panel.config(text=f"Agents: {len(self.agents)}")
+
+    def add_random_agents(self):
+        if not self.n:
+            return
+        blocked = self.cells == self.codes[self.obstacle_color]
+        if self.components is None:
+            self.components = ComponentLabels(blocked)
+        free = np.flatnonzero((self.cells < self.codes[self.source_color]).ravel() & ~blocked.ravel())
+        rng = np.random.default_rng()
+        # pair cells inside the same region so every new agent has somewhere reachable to go
+        labels = self.components.labels[free]
+        added = 0
+        for start in rng.permutation(free).tolist():
+            if added == self.agents_per_click:
+                break
+            mates = free[(labels == self.components.labels[start]) & (free != start)]
+            if start not in free or not len(mates):
+                continue
+            goal = int(rng.choice(mates))
+            keep = (free != start) & (free != goal)
+            free, labels = free[keep], labels[keep]
+            self.agents.append((divmod(start, self.m), divmod(goal, self.m)))
+            self.set_color(*divmod(start, self.m), self.source_color)
+            self.set_color(*divmod(goal, self.m), self.dest_color)
+            added += 1
+        self.info_panel.config(text=f"Agents: {len(self.agents)}")
+
+    def start_agents(self):
+        if not self.agents:
+            messagebox.showerror("Missing Agents", "Please place at least one start/end pair or add random agents!")
+            return
+        window = self.window_entry.get().strip()
+        try:
+            window = int(window) if window else None
+        except ValueError:
+            messagebox.showerror("Invalid Window", "Please enter a whole number of steps or leave it empty")
+            return
+        if self.searching:
+            return
+
+        self.searching = True
+        self.stopped = False
+        self.clear_path()
+        self.update_button_states()
+        graph = GridGraph(self.cells == self.codes[self.obstacle_color], self.cost_lut[self.cells])
+        planner = CooperativePlanner(graph, window=window, time_budget=10)
+        started = time.perf_counter()
+        self.agent_paths = planner.plan(self.agents)
+        elapsed = time.perf_counter() - started
+        self.agent_summary = (f"Agents: {len(self.agents) - len(planner.failed)}/{len(self.agents)} routed   "
+                              f"Planning: {elapsed * 1000:.0f} ms")
+        self.agent_time = 0
+        self.run_agents()
+
+    def run_agents(self):
+        if self.stopped:
+            return
+        t = self.agent_time
+        first_endpoint = self.codes[self.source_color]
+        live = [path for path in self.agent_paths if path]
+        for path in live:
+            if t and t < len(path):
+                i, j = path[t - 1]
+                if self.cells[i, j] < first_endpoint:
+                    self.renderer.paint(i, j, self.codes[self.path_color])
+        for path in live:
+            i, j = path[min(t, len(path) - 1)]
+            if self.cells[i, j] < first_endpoint:
+                self.renderer.paint(i, j, self.codes[self.current_color])
+
+        makespan = max((len(path) for path in live), default=1)
+        self.info_panel.config(text=f"{self.agent_summary}   Time: {min(t, makespan - 1)}/{makespan - 1}")
+        if t + 1 >= makespan:
+            self.searching = False
+            costs = sum(len(path) - 1 for path in live)
+            self.info_panel.config(text=f"{self.agent_summary}   Makespan: {makespan - 1}   Sum of costs: {costs}")
+            self.update_button_states()
+            return
+        self.agent_time += 1
+        # the speed slider maps to the delay between time steps here, since every frame is one tick
+        delay = self.step_delay + int(400 * (1 - self.speed_scale.get() / 100))
+        self.after_id = self.root.after(delay, self.run_agents)
+
+    def stop_animation(self):
+        self.stopped = True
+        self.searching = False
+        if self.after_id:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+        if self.search is not None:
+            # closing the generator lets a trace recorder finish its file right away
+            self.search.close()
+            self.search = None
+        self.update_button_states()
+
+    def clear_path(self):
+        self.renderer.update(self.cells)
+        self.states_explored = 0
+        self.info_panel.config(text="States Explored: 0")
+
+    def initialize_pathfinder(self, start=None):
+        blocked = self.cells == self.codes[self.obstacle_color]
+        if self.components is None:
+            self.components = ComponentLabels(blocked)
+        self.pathfinder = PathFinder(
+            grid=blocked,
+            start=start or self.source_pos,
+            end=self.dest_pos,
+            terrain_costs=self.cost_lut[self.cells],
+            components=self.components,
+            diagonal=self.diagonal.get(),
+            corner_cutting=self.corner_rules[self.corner_box.get()]
+        )
+
+    def solve(self):
+        algorithm = self.algo_var.get()
+        if algorithm not in PathFinder.ALGORITHMS:
+            return
+        if not self.pathfinder.reachable():
+            self.handle_solution(None)
+            return
+        if algorithm == "D* Lite":
+            # the planner survives between runs so edits only repair the affected part of the search
+            generator = self.pathfinder.d_star_lite_generator(self.planner)
+            self.planner = self.pathfinder.planner
+        else:
+            generator = getattr(self.pathfinder, PathFinder.ALGORITHMS[algorithm])()
+        if self.record_trace.get():
+            filename = filedialog.asksaveasfilename(parent=self.root, defaultextension='.trace',
+                                                    filetypes=[("Search traces", "*.trace")])
+            if filename:
+                generator = TraceRecorder(self.pathfinder, algorithm, filename).wrap(generator)
+        self.search = generator
+        self.run_algorithm(generator)
+
+    def steps_per_frame(self):
+        # the slider is logarithmic: 0 is one step per tick, 100 lets the frame budget decide
+        speed = self.speed_scale.get()
+        return None if speed >= 100 else int(10 ** (speed / 20))
+
+    def run_algorithm(self, generator):
+        if self.stopped:
+            return
+
+        limit = self.steps_per_frame()
+        deadline = time.perf_counter() + self.frame_budget
+        steps, current, visited = 0, None, None
+        try:
+            while True:
+                current, visited = next(generator)
+                steps += 1
+                if steps == limit or time.perf_counter() >= deadline:
+                    break
+        except StopIteration as e:
+            self.states_explored += steps
+            if current is not None:
+                self.update_visuals(current, visited)
+            self.handle_solution(e.value)
+            return
+
+        self.states_explored += steps
+        self.update_visuals(current, visited)
+        self.info_panel.config(text=f"States Explored: {self.states_explored}")
+        self.after_id = self.root.after(self.step_delay, lambda: self.run_algorithm(generator))
+
+    def update_visuals(self, current, visited):
+        # only cells that were reached since the last frame, plus the old and new current cell, get repainted
+        if self.painted_visited is None:
+            self.painted_visited = np.zeros(self.n * self.m, dtype=bool)
+        painted = self.painted_visited
+        show_visited = self.show_visited.get()
+        fresh = np.flatnonzero(visited != painted) if show_visited else np.empty(0, dtype=np.intp)
+        if len(fresh) > GridCanvas.FULL_REDRAW_RATIO * painted.size:
+            painted[:] = visited
+            frame = self.cells.copy()
+            endpoints = frame >= self.codes[self.source_color]
+            frame[visited.reshape(self.n, self.m) & ~endpoints] = self.codes[self.visited_color]
+            if not endpoints.flat[current]:
+                frame.flat[current] = self.codes[self.current_color]
+            self.painted_current = current
+            self.renderer.update(frame)
+            return
+
+        painted[fresh] = True
+        cells = self.cells.ravel()
+        first_endpoint = self.codes[self.source_color]
+        dirty = fresh.tolist()
+        if self.painted_current is not None:
+            dirty.append(self.painted_current)
+        for node in dirty:
+            code = cells[node]
+            if code < first_endpoint and show_visited and painted[node]:
+                code = self.codes[self.visited_color]
+            self.renderer.paint(*divmod(node, self.m), code)
+        if cells[current] < first_endpoint:
+            self.renderer.paint(*divmod(current, self.m), self.codes[self.current_color])
+        self.painted_current = current
+
+    def set_temp_color(self, i, j, color):
+        if (i, j) not in [self.source_pos, self.dest_pos]:
+            self.renderer.paint(i, j, self.codes[color])
+
+    def handle_solution(self, path):
+        self.searching = False
+        self.update_button_states()
+        if path:
+            graph = self.pathfinder.graph
+            self.highlight_path(path)
+            self.info_panel.config(text=f"States Explored: {self.states_explored}   "
+                                        f"Path Cost: {graph.path_cost(path) / graph.scale:g}")
+        else:
+            messagebox.showinfo("No Path", "No valid path exists between start and end points!")
+
+    def highlight_path(self, path):
+        for pos in path[1:-1]:
+            i, j = pos
+            self.set_temp_color(i, j, self.path_color)
+
+    def show_distance_field(self):
+        if not self.dest_pos:
+            messagebox.showerror("Missing Points", "Please set an end (green) point first!")
+            return
+        self.initialize_pathfinder(start=self.dest_pos)
+        dist = DistanceField.for_goal(self.pathfinder.graph, self.pathfinder.target).dist.reshape(self.n, self.m)
+        reachable = dist != UNREACHABLE
+        scale = dist[reachable].max(initial=0) or 1
+        near, far = self.renderer.rgb[self.codes[self.path_color]], np.array([108, 92, 231], dtype=np.uint8)
+        t = (np.where(reachable, dist, 0) / scale)[..., None]
+        rgb = self.renderer.rgb[self.cells].copy()
+        heat = (near * (1 - t) + far * t).astype(np.uint8)
+        free = reachable & (self.cells < self.codes[self.source_color])
+        rgb[free] = heat[free]
+        self.renderer.draw_pixels(rgb)
+        self.info_panel.config(text=f"Distance field: {int(reachable.sum())} reachable cells, "
+                                    f"farthest at cost {int(dist[reachable].max(initial=0))}")
+
+    def open_replay(self):
+        filenames = filedialog.askopenfilenames(parent=self.root, title="Choose one or two traces",
+                                                filetypes=[("Search traces", "*.trace")])
+        if not filenames:
+            return
+        if len(filenames) > 2:
+            messagebox.showerror("Too Many Traces", "Please choose at most two traces to compare")
+            return
+        try:
+            traces = [SearchTrace(filename) for filename in filenames]
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Invalid Trace", str(e))
+            return
+        TraceReplay(self, traces)
+
+    def toggle_visited_display(self):
+        # forget what was painted so the next frame brings the whole visited set back
+        self.painted_visited = None
+        if not self.show_visited.get():
+            self.clear_visited_colors()
+
+    def toggle_diagonal(self):
+        # HPA*'s abstraction only knows 4-connected entrances, so it sits out on 8-connected grids
+        if self.diagonal.get() and self.algo_var.get() == "HPA*":
+            self.algo_var.set("A*")
+        self.update_button_states()
+
+    def clear_visited_colors(self):
+        shown = self.renderer.shown
+        if shown is not None:
+            outdated = (shown == self.codes[self.visited_color]) | (shown == GridCanvas.STALE)
+            self.renderer.update(np.where(outdated, self.cells, shown))
+
+    def update_button_states(self):
+        state_normal = tk.NORMAL if not self.searching else tk.DISABLED
+        state_stop = tk.NORMAL if self.searching else tk.DISABLED
+
+        self.generate_btn.config(state=state_normal)
+        self.clear_btn.config(state=state_normal)
+        self.random_btn.config(state=state_normal)
+        self.solve_btn.config(state=state_normal)
+        self.stop_btn.config(state=state_stop)
+        self.clear_path_btn.config(state=state_normal)
+        self.n_entry.config(state=state_normal)
+        self.m_entry.config(state=state_normal)
+        self.bfs_rb.config(state=state_normal)
+        self.dfs_rb.config(state=state_normal)
+        self.a_star_rb.config(state=state_normal)
+        self.alt_rb.config(state=state_normal)
+        self.dijkstra_rb.config(state=state_normal)
+        self.hpa_rb.config(state=tk.DISABLED if self.diagonal.get() else state_normal)
+        self.d_star_rb.config(state=state_normal)
+        self.flow_rb.config(state=state_normal)
+        self.field_btn.config(state=state_normal)
+        self.record_toggle.config(state=state_normal)
+        self.replay_btn.config(state=state_normal)
+        self.agent_toggle.config(state=state_normal)
+        self.add_agents_btn.config(state=state_normal)
+        self.window_entry.config(state=state_normal)
+        self.diagonal_toggle.config(state=state_normal)
+        self.corner_box.config(state="readonly" if not self.searching else tk.DISABLED)
+
+
+
+if __name__ == "__main__":
+    main_root = tk.Tk()
+    app = GridUI(main_root)
+    main_root.mainloop()
@@ -0,0 +1,176 @@
+import struct
+import numpy as np
+from functools import cached_property
+
+MAGIC = b'PFTR'
+VERSION = 1
+HEADER = struct.Struct('<4sHH16siiiiQ')
+EVENT = np.dtype([('node', '<i4'), ('event', 'u1'), ('g', '<i4'), ('f', '<i4')])
+EXPAND, DISCOVER, PATH = 0, 1, 2
+
+
+class TraceRecorder:
+    FLUSH_SIZE = 1 << 16
+
+    def __init__(self, pathfinder, algorithm, filename):
+        self.pathfinder = pathfinder
+        self.algorithm = algorithm
+        self.filename = filename
+        self.buffer = []
+        self.count = 0
+        graph = pathfinder.graph
+        self.g = np.full(graph.size, -1, dtype=np.int64)
+        self.recorded = np.zeros(graph.size, dtype=bool)
+        self.heuristic = None
+
+    def _emit(self, node, event, g, f):
+        self.buffer.append((node, event, g, f))
+        if len(self.buffer) >= self.FLUSH_SIZE:
+            self._flush()
+
+    def _flush(self):
+        if self.buffer:
+            np.array(self.buffer, dtype=EVENT).tofile(self.file)
+            self.count += len(self.buffer)
+            self.buffer = []
+
+    def _discover(self, node, seen):
+        if seen[node] and not self.recorded[node]:
+            self.recorded[node] = True
+            self._emit(node, DISCOVER, -1, -1)
+
+    def _expand(self, node):
+        pathfinder = self.pathfinder
+        parent = -1 if pathfinder.parent is None else int(pathfinder.parent[node])
+        if node == pathfinder.source:
+            self.g[node] = 0
+        elif parent >= 0 and self.g[parent] >= 0:
+            self.g[node] = self.g[parent] + pathfinder.graph.step_cost(parent, node)
+        g = int(self.g[node])
+        f = g + self.heuristic(node) if self.heuristic and g >= 0 else g
+        self._emit(node, EXPAND, g, f)
+
+    def wrap(self, generator):
+        graph = self.pathfinder.graph
+        costs = np.where(graph.blocked, 0, graph.costs).astype(np.uint8)
+        self.file = open(self.filename, 'wb')
+        self.file.write(self._header())
+        self.file.write(costs.tobytes())
+        previous = None
+        try:
+            while True:
+                try:
+                    current, seen = next(generator)
+                except StopIteration as e:
+                    path = e.value
+                    break
+                if previous is None:
+                    self.heuristic = self._search_heuristic()
+                # neighbours are marked while the engine resumes, so they show up one yield later
+                if previous is not None:
+                    for neighbor in graph.neighbors(previous):
+                        self._discover(neighbor, seen)
+                self._discover(current, seen)
+                self._expand(current)
+                previous = current
+                yield current, seen
+
+            g, previous = 0, None
+            for cell in path or ():
+                node = graph.to_node(cell)
+                if previous is not None:
+                    g += graph.step_cost(previous, node)
+                self._emit(node, PATH, g, g)
+                previous = node
+            return path
+        finally:
+            # a stopped animation still leaves a readable trace of everything up to that point
+            self._flush()
+            self.file.seek(0)
+            self.file.write(self._header())
+            self.file.close()
+
+    def _search_heuristic(self):
+        # f is rebuilt from the same bound the search used; the landmarks are only known once ALT has started
+        pathfinder = self.pathfinder
+        if self.algorithm == "A*":
+            return pathfinder.heuristic
+        if self.algorithm == "ALT" and pathfinder.landmarks is not None:
+            return pathfinder.alt_heuristic(pathfinder.landmarks)
+        return None
+
+    def record(self, generator):
+        search = self.wrap(generator)
+        expanded = 0
+        try:
+            while True:
+                next(search)
+                expanded += 1
+        except StopIteration as e:
+            return e.value, expanded
+
+    def _header(self):
+        pathfinder = self.pathfinder
+        return HEADER.pack(MAGIC, VERSION, 0, self.algorithm.encode()[:16], pathfinder.n, pathfinder.m,
+                           pathfinder.source, pathfinder.target, self.count)
+
+
+class SearchTrace:
+    def __init__(self, filename):
+        self.filename = filename
+        with open(filename, 'rb') as f:
+            raw = f.read(HEADER.size)
+        if len(raw) < HEADER.size:
+            raise ValueError(f"{filename} is not a search trace")
+        magic, version, _, algorithm, self.n, self.m, self.source, self.target, count = HEADER.unpack(raw)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{filename} is not a version {VERSION} search trace")
+        self.algorithm = algorithm.rstrip(b'\0').decode()
+        self.size = self.n * self.m
+        self.costs = np.fromfile(filename, dtype=np.uint8, count=self.size, offset=HEADER.size).reshape(self.n, self.m)
+        if self.costs.size != self.size:
+            raise ValueError(f"{filename} is truncated")
+        if count:
+            self.events = np.memmap(filename, dtype=EVENT, mode='r', offset=HEADER.size + self.size, shape=(count,))
+        else:
+            self.events = np.zeros(0, dtype=EVENT)
+
+    @property
+    def blocked(self):
+        return self.costs == 0
+
+    @cached_property
+    def expansions(self):
+        return np.flatnonzero(self.events['event'] == EXPAND)
+
+    @property
+    def steps(self):
+        return len(self.expansions)
+
+    @cached_property
+    def path(self):
+        return self.events['node'][self.events['event'] == PATH].tolist()
+
+    def _end(self, step):
+        return int(self.expansions[step - 1]) + 1 if step > 0 else 0
+
+    def current_at(self, step):
+        step = min(step, self.steps)
+        return int(self.events['node'][self.expansions[step - 1]]) if step > 0 else None
+
+    def seen_at(self, step):
+        seen = np.zeros(self.size, dtype=bool)
+        return self.replay(seen, 0, step)
+
+    def replay(self, seen, start, stop):
+        # moving forward only touches the events between the two steps
+        start, stop = min(start, self.steps), min(stop, self.steps)
+        events = self.events[self._end(start):self._end(stop)]
+        seen[events['node'][events['event'] != PATH]] = True
+        return seen
+
+    def event_at(self, step):
+        if step < 1 or step > self.steps:
+            return None
+        node, _, g, f = self.events[self.expansions[step - 1]].tolist()
+        return node, g, f